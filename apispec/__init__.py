@@ -6,9 +6,12 @@ __version__ = '0.6.0.dev0'
 __author__ = 'Steven Loria, Josh Carp, and contributors'
 __license__ = 'MIT'
 
-from .core import APISpec, Path
+from .core import APISpec, Path, merge_specs
+from .compare import diff
 
 __all__ = [
     'APISpec',
     'Path',
+    'merge_specs',
+    'diff',
 ]
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""Coroutines behind the ``*_async`` methods of `APISpec <apispec.APISpec>`.
+Requires Python 3.5+.
+
+Helpers may be coroutine functions, or regular functions returning
+awaitables. The helpers called for a path or definition run concurrently,
+as do those of every path passed to `add_paths`. Regular helpers are called
+directly, without scheduling a task.
+"""
+import asyncio
+import inspect
+from timeit import default_timer
+
+from apispec.core import HelperCalls
+
+
+async def _timed(spec, kind, func, start, awaitable):
+    try:
+        ret = await awaitable
+    except Exception as error:
+        spec.stats(kind, func, default_timer() - start, error)
+        raise
+    spec.stats(kind, func, default_timer() - start)
+    return ret
+
+
+def _call(spec, kind, func, args, kwargs):
+    if spec.stats is None:
+        return func(*args, **kwargs)
+    start = default_timer()
+    try:
+        ret = func(*args, **kwargs)
+    except Exception as error:
+        spec.stats(kind, func, default_timer() - start, error)
+        raise
+    if inspect.isawaitable(ret):
+        return _timed(spec, kind, func, start, ret)
+    spec.stats(kind, func, default_timer() - start)
+    return ret
+
+
+async def run_helpers(spec, steps):
+    """Asynchronous version of `APISpec._run_helpers`. Awaitables returned by
+    a batch of helper calls are awaited together. With ``stats``, the time of a
+    coroutine helper runs until its result is available.
+    """
+    step = next(steps)
+    while isinstance(step, HelperCalls):
+        results = []
+        try:
+            for func, args, kwargs in step:
+                results.append(_call(spec, step.kind, func, args, kwargs))
+        except Exception:
+            for ret in results:
+                if inspect.iscoroutine(ret):
+                    ret.close()
+            raise
+        pending = [index for index, ret in enumerate(results) if inspect.isawaitable(ret)]
+        if pending:
+            values = await asyncio.gather(*[results[index] for index in pending])
+            for index, value in zip(pending, values):
+                results[index] = value
+        step = steps.send(results)
+    steps.close()
+    return step
+
+
+async def add_path(spec, path=None, operations=None, **kwargs):
+    """See `APISpec.add_path_async <apispec.APISpec.add_path_async>`."""
+    spec._setup_triggered_plugins('path', kwargs)
+    steps = spec._path_steps(spec._path_context(), path=path, operations=operations, **kwargs)
+    spec._store_path(await run_helpers(spec, steps))
+
+
+async def add_paths(spec, paths):
+    """See `APISpec.add_paths_async <apispec.APISpec.add_paths_async>`."""
+    paths = list(paths)
+    for path_kwargs in paths:
+        spec._setup_triggered_plugins('path', path_kwargs)
+    context = spec._path_context()
+    built = await asyncio.gather(*[
+        run_helpers(spec, spec._path_steps(context, **path_kwargs)) for path_kwargs in paths
+    ])
+    for path in built:
+        spec._store_path(path)
+
+
+async def _build_definition(spec, helpers, name, properties=None, enum=None, **kwargs):
+    parts = await run_helpers(spec, spec._definition_steps(helpers, name, **kwargs))
+    return name, parts, properties, enum
+
+
+async def definition(spec, name, properties=None, enum=None, **kwargs):
+    """See `APISpec.definition_async <apispec.APISpec.definition_async>`."""
+    spec._setup_triggered_plugins('definition', kwargs)
+    spec._store_definition(*await _build_definition(
+        spec, spec._definition_context(), name, properties=properties, enum=enum, **kwargs
+    ))
+
+
+async def definitions(spec, definitions):
+    """See `APISpec.definitions_async <apispec.APISpec.definitions_async>`."""
+    definitions = list(definitions)
+    for definition_kwargs in definitions:
+        spec._setup_triggered_plugins('definition', definition_kwargs)
+    helpers = spec._definition_context()
+    built = await asyncio.gather(*[
+        _build_definition(spec, helpers, **definition_kwargs)
+        for definition_kwargs in definitions
+    ])
+    for args in built:
+        spec._store_definition(*args)
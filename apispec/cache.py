@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""On-disk cache for generated specs, keyed by a fingerprint of their sources.
+
+Example: ::
+
+    from apispec.cache import SpecCache, fingerprint
+
+    cache = SpecCache('/var/cache/apispec')
+    key = fingerprint(spec, views=views, schemas=[PetSchema, CategorySchema])
+
+    def build():
+        spec.definition('Category', schema=CategorySchema)
+        spec.definition('Pet', schema=PetSchema)
+        spec.add_paths({'view': view} for view in views)
+        return spec
+
+    spec_dict = cache.get_or_build(key, build)
+"""
+import os
+import re
+import json
+import hashlib
+import tempfile
+
+import apispec
+from apispec.compat import iteritems, text_type
+from apispec.utils import get_docstring_parser
+
+RE_ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+SCALAR_TYPES = (type(None), bool, int, float, text_type, bytes)
+
+
+def _qualname(obj):
+    return '{0}.{1}'.format(
+        getattr(obj, '__module__', None),
+        getattr(obj, '__qualname__', getattr(obj, '__name__', None)),
+    )
+
+
+def _stable_order(items):
+    """Return ``items`` sorted by a description that doesn't depend on the
+    order in which they are walked.
+    """
+    return sorted(items, key=lambda item: _describe(item, set()))
+
+
+def _describe(obj, seen):
+    """Return a text description of an object that is stable across processes.
+
+    marshmallow schema classes and fields are described by their declared
+    fields and attributes, functions by their qualified names.
+    """
+    if isinstance(obj, SCALAR_TYPES):
+        return repr(obj)
+    if isinstance(obj, (list, tuple)):
+        return '[{0}]'.format(', '.join(_describe(item, seen) for item in obj))
+    # Unordered collections are walked in a stable order, since only the first
+    # occurrence of a schema in ``seen`` is described in full
+    if isinstance(obj, (set, frozenset)):
+        return '{{{0}}}'.format(', '.join(
+            _describe(item, seen) for item in _stable_order(obj)
+        ))
+    if isinstance(obj, dict):
+        return '{{{0}}}'.format(', '.join(
+            '{0}: {1}'.format(_describe(key, seen), _describe(obj[key], seen))
+            for key in _stable_order(obj)
+        ))
+    if isinstance(obj, type):
+        name = _qualname(obj)
+        fields = getattr(obj, '_declared_fields', None)
+        if fields is None or obj in seen:
+            return name
+        seen.add(obj)
+        return '{0}{1}'.format(name, _describe(fields, seen))
+    if callable(obj) and hasattr(obj, '__name__'):
+        return _qualname(obj)
+    if hasattr(obj, '__dict__'):
+        attrs = dict(
+            (key, value) for key, value in iteritems(vars(obj))
+            if not key.startswith('_') and key != 'parent'
+        )
+        return '{0}{1}'.format(_qualname(type(obj)), _describe(attrs, seen))
+    return RE_ADDRESS.sub('', repr(obj))
+
+
+def fingerprint(spec, views=(), schemas=(), extra=()):
+    """Return a key identifying the inputs of a spec's generation.
+
+    The key covers the apispec version, the spec's info, options and plugins,
+    including plugins whose setup waits for a trigger along with their
+    triggers, its docstring parser and that of its precompiled operations,
+    the qualified names and docstrings of ``views``, and the declared fields
+    of the marshmallow ``schemas``. It changes when any of them do.
+
+    :param APISpec spec: The spec to build. Call this before registering paths
+        and definitions.
+    :param views: View functions whose docstrings are used by the spec.
+    :param schemas: marshmallow `Schema` classes used by the spec.
+    :param extra: Any other values the spec depends on.
+    :rtype: str
+    """
+    seen = set()
+    parts = [
+        apispec.__version__,
+        _describe(spec.info, seen),
+        _describe(spec.options, seen),
+        _describe(sorted(spec.plugins), seen),
+        _describe(sorted(iteritems(spec._deferred_plugins)), seen),
+        _qualname(get_docstring_parser(spec.docstring_parser)),
+        _describe(getattr(spec.precompiled, 'parser', None), seen),
+    ]
+    parts.extend(
+        '{0}:{1!r}'.format(_qualname(view), view.__doc__) for view in views
+    )
+    parts.extend(_describe(schema, seen) for schema in schemas)
+    parts.append(_describe(list(extra), seen))
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+class SpecCache(object):
+    """Stores generated specs as JSON files in a local directory.
+
+    :param str directory: Cache directory. Created if it does not exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _filename(self, key):
+        return os.path.join(self.directory, '{0}.json'.format(key))
+
+    def get(self, key):
+        """Return the spec stored under ``key`` as a `dict`, or `None` if there
+        is none. Mapping keys are strings, as in the serialized spec.
+
+        :param str key: Return value of `fingerprint`.
+        """
+        try:
+            with open(self._filename(key)) as fp:
+                return json.load(fp)
+        except (IOError, OSError, ValueError):
+            return None
+
+    def set(self, key, spec):
+        """Store a spec under ``key``. The file is written atomically, so
+        concurrent readers never see a partial spec.
+
+        :param str key: Return value of `fingerprint`.
+        :param spec: An `APISpec <apispec.APISpec>` or the `dict` it generated.
+        """
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as fp:
+                if isinstance(spec, dict):
+                    json.dump(spec, fp)
+                else:
+                    spec.write(fp)
+            getattr(os, 'replace', os.rename)(tmp_name, self._filename(key))
+        except Exception:
+            os.remove(tmp_name)
+            raise
+
+    def get_or_build(self, key, build):
+        """Return the spec stored under ``key``. If there is none, call ``build``
+        and store the spec it returns.
+
+        :param str key: Return value of `fingerprint`.
+        :param callable build: Function taking no arguments and returning an
+            `APISpec <apispec.APISpec>` or the `dict` it generated.
+        :rtype: dict
+        """
+        ret = self.get(key)
+        if ret is None:
+            self.set(key, build())
+            ret = self.get(key)
+        return ret
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Compare specs and compute JSON Patches between them."""
+from apispec.compat import iteritems
+from .core import STREAMED_SECTIONS, _stringify_keys
+
+
+class SpecDiff(object):
+    """Differences between two specs, as returned by `diff`.
+
+    :ivar list patch: `RFC 6902 <https://tools.ietf.org/html/rfc6902>`_ operations
+        that turn the old spec into the new one.
+    :ivar list breaking: Descriptions of the changes that can break existing
+        clients, e.g. removed operations or newly required parameters.
+    """
+
+    def __init__(self):
+        self.patch = []
+        self.breaking = []
+
+    def __bool__(self):
+        return bool(self.patch)
+    __nonzero__ = __bool__
+
+    def __repr__(self):
+        return '<SpecDiff(patch={0!r}, breaking={1!r})>'.format(self.patch, self.breaking)
+
+    def add(self, pointer, value):
+        self.patch.append({'op': 'add', 'path': pointer, 'value': value})
+
+    def remove(self, pointer):
+        self.patch.append({'op': 'remove', 'path': pointer})
+
+    def replace(self, pointer, value):
+        self.patch.append({'op': 'replace', 'path': pointer, 'value': value})
+
+
+def escape_pointer(key):
+    """Escape a key for use in a JSON Pointer, as defined by RFC 6901."""
+    return str(key).replace('~', '~0').replace('/', '~1')
+
+
+def _pointer(*keys):
+    return ''.join('/' + escape_pointer(key) for key in keys)
+
+
+def _entry_hashes(spec):
+    """Return the spec as a `dict` along with the hash of each entry of its
+    ``paths``, ``definitions`` and ``parameters`` sections, as kept by an
+    `APISpec`. The hashes are `None` for a `dict`, since computing them would
+    cost more than comparing the entries.
+    """
+    if isinstance(spec, dict):
+        return spec, None
+    spec.fingerprint()
+    return spec.to_dict(), spec._entry_hashes
+
+
+def _parameter_key(parameter):
+    if '$ref' in parameter:
+        return parameter['$ref']
+    return '{0}:{1}'.format(parameter.get('in'), parameter.get('name'))
+
+
+def _required_parameters(operation):
+    return set(
+        _parameter_key(parameter) for parameter in operation.get('parameters') or []
+        if '$ref' in parameter or parameter.get('required')
+    )
+
+
+def _diff_operation(result, method, path, old, new):
+    where = '{0} {1}'.format(method.upper(), path)
+    old_params = set(_parameter_key(param) for param in old.get('parameters') or [])
+    for key in sorted(_required_parameters(new) - _required_parameters(old)):
+        result.breaking.append('Added required parameter {0} to {1}'.format(key, where))
+    new_params = set(_parameter_key(param) for param in new.get('parameters') or [])
+    for key in sorted(old_params - new_params):
+        result.breaking.append('Removed parameter {0} from {1}'.format(key, where))
+    old_responses = set(str(code) for code in old.get('responses') or {})
+    new_responses = set(str(code) for code in new.get('responses') or {})
+    for code in sorted(old_responses - new_responses):
+        result.breaking.append('Removed response {0} from {1}'.format(code, where))
+
+
+def _diff_path(result, key, old, new):
+    for method, operation in iteritems(old):
+        if method not in new:
+            result.remove(_pointer('paths', key, method))
+            result.breaking.append('Removed operation {0} {1}'.format(method.upper(), key))
+        elif operation != new[method]:
+            result.replace(_pointer('paths', key, method), new[method])
+            _diff_operation(result, method, key, operation, new[method])
+    for method, operation in iteritems(new):
+        if method not in old:
+            result.add(_pointer('paths', key, method), operation)
+
+
+def _diff_definition(result, key, old, new):
+    result.replace(_pointer('definitions', key), new)
+    old_props = set(old.get('properties') or {})
+    new_props = set(new.get('properties') or {})
+    for prop in sorted(old_props - new_props):
+        result.breaking.append('Removed property {0} from definition {1}'.format(prop, key))
+    for prop in sorted(set(new.get('required') or []) - set(old.get('required') or [])):
+        result.breaking.append('Added required property {0} to definition {1}'.format(prop, key))
+    if old.get('type') != new.get('type'):
+        result.breaking.append('Changed type of definition {0}'.format(key))
+
+
+def _diff_parameter(result, key, old, new):
+    result.replace(_pointer('parameters', key), new)
+    if new.get('required') and not old.get('required'):
+        result.breaking.append('Parameter {0} became required'.format(key))
+    if (old.get('in'), old.get('name')) != (new.get('in'), new.get('name')):
+        result.breaking.append('Changed location or name of parameter {0}'.format(key))
+
+
+SECTION_DIFFS = {
+    'paths': _diff_path,
+    'definitions': _diff_definition,
+    'parameters': _diff_parameter,
+}
+
+REMOVED_MESSAGES = {
+    'paths': 'Removed path {0}',
+    'definitions': 'Removed definition {0}',
+    'parameters': 'Removed parameter {0}',
+}
+
+
+def diff(old, new):
+    """Compare two specs section by section.
+
+    Paths are compared by method, definitions and parameters by name. If
+    both specs are `APISpec <apispec.APISpec>` objects, entries whose hashes,
+    as maintained by `APISpec.fingerprint <apispec.APISpec.fingerprint>`, are
+    equal in both specs are skipped without being compared.
+
+    :param old: An `APISpec <apispec.APISpec>` or the `dict` it generated.
+    :param new: An `APISpec <apispec.APISpec>` or the `dict` it generated.
+    :rtype: SpecDiff
+    """
+    result = SpecDiff()
+    old, old_hashes = _entry_hashes(old)
+    new, new_hashes = _entry_hashes(new)
+    use_hashes = old_hashes is not None and new_hashes is not None
+
+    for key in sorted(set(old) | set(new)):
+        if key in STREAMED_SECTIONS:
+            continue
+        if key not in new:
+            result.remove(_pointer(key))
+        elif key not in old:
+            result.add(_pointer(key), new[key])
+        elif _stringify_keys(old[key]) != _stringify_keys(new[key]):
+            result.replace(_pointer(key), new[key])
+
+    for section in STREAMED_SECTIONS:
+        old_entries = old.get(section) or {}
+        new_entries = new.get(section) or {}
+        if section not in new and section in old:
+            result.remove(_pointer(section))
+            result.breaking.extend(
+                REMOVED_MESSAGES[section].format(key) for key in sorted(old_entries)
+            )
+            continue
+        if section not in old and section in new:
+            result.add(_pointer(section), new_entries)
+            continue
+        for key in sorted(old_entries):
+            if key not in new_entries:
+                result.remove(_pointer(section, key))
+                result.breaking.append(REMOVED_MESSAGES[section].format(key))
+                continue
+            if use_hashes:
+                if old_hashes[section].get(key) == new_hashes[section].get(key):
+                    continue
+            elif old_entries[key] == new_entries[key]:
+                continue
+            old_value = _stringify_keys(old_entries[key])
+            new_value = _stringify_keys(new_entries[key])
+            if old_value != new_value:
+                SECTION_DIFFS[section](result, key, old_value, new_value)
+        for key in sorted(new_entries):
+            if key not in old_entries:
+                result.add(_pointer(section, key), new_entries[key])
+    return result
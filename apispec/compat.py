@@ -3,6 +3,12 @@ import sys
 
 PY2 = int(sys.version[0]) == 2
 
+
+def iscoroutinefunction(func):
+    """Return `True` if ``func`` is a coroutine function (Python 3.5+)."""
+    import inspect
+    return getattr(inspect, 'iscoroutinefunction', lambda func: False)(func)
+
 if PY2:
     text_type = unicode
     binary_type = str
@@ -12,6 +18,20 @@ if PY2:
     iterkeys = lambda d: d.iterkeys()
     itervalues = lambda d: d.itervalues()
     iteritems = lambda d: d.iteritems()
+
+    def get_argspec(func):
+        """Return ``(args, optional, varkw)`` for a callable: the names of its
+        arguments, the names of those with a default, and whether it accepts
+        ``**kwargs``. Raise `TypeError` if the callable can't be inspected.
+        """
+        import inspect
+        if not (inspect.isfunction(func) or inspect.ismethod(func)):
+            func = getattr(func, '__call__', func)
+        spec = inspect.getargspec(func)
+        args = spec.args[1:] if inspect.ismethod(func) else spec.args
+        defaults = spec.defaults or ()
+        optional = set(args[len(args) - len(defaults):]) if defaults else set()
+        return args, optional, spec.keywords is not None
 else:
     text_type = str
     binary_type = bytes
@@ -21,3 +41,20 @@ else:
     iterkeys = lambda d: d.keys()
     itervalues = lambda d: d.values()
     iteritems = lambda d: d.items()
+
+    def get_argspec(func):
+        """Return ``(args, optional, varkw)`` for a callable: the names of its
+        arguments, the names of those with a default, and whether it accepts
+        ``**kwargs``. Raise `TypeError` if the callable can't be inspected.
+        """
+        import inspect
+        try:
+            params = list(inspect.signature(func).parameters.values())
+        except ValueError as error:
+            raise TypeError(str(error))
+        kinds = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+        args = [param.name for param in params if param.kind in kinds]
+        optional = set(param.name for param in params
+                       if param.kind in kinds and param.default is not param.empty)
+        varkw = any(param.kind == param.VAR_KEYWORD for param in params)
+        return args, optional, varkw
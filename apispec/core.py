@@ -1,8 +1,18 @@
 # -*- coding: utf-8 -*-
 """Core apispec classes and functions."""
 import re
+import json
+import functools
+import itertools
+import threading
+import contextlib
+from collections import OrderedDict
+from timeit import default_timer
 
-from apispec.compat import iterkeys
+from apispec.compat import (
+    iterkeys, itervalues, iteritems, basestring, get_argspec, iscoroutinefunction
+)
+from apispec import stats as helper_stats
 from .exceptions import APISpecError, PluginError
 
 VALID_METHODS = [
@@ -13,9 +23,70 @@ VALID_METHODS = [
     'delete',
     'head',
 ]
+_VALID_METHODS = frozenset(VALID_METHODS)
 
 SWAGGER_VERSION = '2.0'
 
+# Locks of a thread-safe `APISpec`, in the order they must be acquired.
+# Per path key locks are acquired after "plugins" and before "paths".
+LOCK_ORDER = ('plugins', 'paths', 'definitions', 'parameters', 'state')
+# Locks held while reading the whole spec
+READ_LOCKS = ('paths', 'definitions', 'parameters', 'state')
+
+# Top-level sections that `APISpec.write` serializes one entry at a time
+# and `APISpec.fingerprint` hashes per entry
+STREAMED_SECTIONS = ('paths', 'definitions', 'parameters')
+
+
+class _NullLock(object):
+    """Stands in for a lock in an `APISpec` that is not thread-safe."""
+
+    def acquire(self):
+        return True
+
+    def release(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_LOCK = _NullLock()
+
+
+class HelperCalls(list):
+    """List of ``(func, args, kwargs)`` helper calls yielded by the generators
+    that build paths and definitions. See `APISpec._run_helpers`.
+
+    :param str kind: Kind of the helpers, as reported to ``stats``.
+    """
+
+    def __init__(self, kind, calls=()):
+        super(HelperCalls, self).__init__(calls)
+        self.kind = kind
+
+
+_spec_dumper = None
+
+
+def get_spec_dumper():
+    """Return a YAML dumper that serializes `dict` subclasses (e.g. `Path`) as
+    plain mappings. yaml is imported on first use.
+    """
+    global _spec_dumper
+    if _spec_dumper is None:
+        import yaml
+
+        class SpecDumper(yaml.SafeDumper):
+            pass
+
+        SpecDumper.add_multi_representer(dict, SpecDumper.represent_dict)
+        _spec_dumper = SpecDumper
+    return _spec_dumper
+
 
 def clean_operations(operations):
     """Ensure that all parameters with "in" equal to "path" are also required
@@ -37,16 +108,59 @@ def clean_operations(operations):
             operation['parameters'] = [get_ref(p) for p in parameters]
 
 
+def _inspect_helper(func, positional):
+    """Index the keyword arguments accepted by a plugin helper.
+
+    Returns a ``(required, accepted)`` tuple of argument names, ignoring the
+    first ``positional`` arguments, which the helper receives positionally.
+    ``accepted`` is `None` if the helper takes ``**kwargs``. Returns `None`
+    if the helper's signature can't be inspected.
+
+    :param callable func: The helper function.
+    :param int positional: Number of leading positional arguments.
+    """
+    try:
+        args, optional, varkw = get_argspec(func)
+    except TypeError:
+        return None
+    args = args[positional:]
+    required = frozenset(arg for arg in args if arg not in optional)
+    accepted = None if varkw else frozenset(args)
+    return required, accepted
+
+
+def _match_helper(signature, kwargs):
+    """Return the keyword arguments to call a helper with, or `None` if the
+    helper requires an argument that ``kwargs`` does not provide.
+
+    :param tuple signature: Return value of `_inspect_helper`.
+    :param dict kwargs: Available keyword arguments.
+    """
+    if signature is None:
+        return kwargs
+    required, accepted = signature
+    if not required.issubset(kwargs):
+        return None
+    if accepted is None:
+        return kwargs
+    return dict((key, value) for key, value in iteritems(kwargs) if key in accepted)
+
+
 class Path(dict):
     """Represents a Swagger Path object.
 
+    The path's operations are stored in the `dict` itself, keyed by HTTP
+    method; `operations` is an alias for the object.
+
     https://github.com/swagger-api/swagger-spec/blob/master/versions/2.0.md#pathsObject
 
     :param str path: The path template, e.g. ``"/pet/{petId}"``
-    :param str method: The HTTP method.
-    :param dict operation: The operation object, as a `dict`. See
+    :param dict operations: Dict mapping HTTP methods to operation objects. See
         https://github.com/swagger-api/swagger-spec/blob/master/versions/2.0.md#operationObject
+    :param kwargs: Extra items stored in the `dict` along with the
+        operations. `update` only merges operations.
     """
+    __slots__ = ('path', )
 
     def __init__(self, path=None, operations=None, **kwargs):
         self.path = path
@@ -57,9 +171,24 @@ class Path(dict):
             raise APISpecError(
                 'One or more HTTP methods are invalid: {0}'.format(", ".join(invalid))
             )
-        self.operations = operations
-        kwargs.update(self.operations)
-        super(Path, self).__init__(**kwargs)
+        super(Path, self).__init__(kwargs)
+        super(Path, self).update(operations)
+
+    @property
+    def operations(self):
+        return self
+
+    @operations.setter
+    def operations(self, operations):
+        self.clear()
+        super(Path, self).update(operations)
+
+    def __getstate__(self):
+        # Never falsy, since pickle and copy skip __setstate__ for falsy states
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
 
     def to_dict(self):
         if not self.path:
@@ -71,8 +200,158 @@ class Path(dict):
     def update(self, path, **kwargs):
         if path.path:
             self.path = path.path
-        self.operations.update(path.operations)
-        super(Path, self).update(path.operations)
+        super(Path, self).update(
+            (method, operation) for method, operation in iteritems(path)
+            if method in _VALID_METHODS
+        )
+
+
+def _stringify_keys(obj):
+    if isinstance(obj, dict):
+        return dict((str(key), _stringify_keys(value)) for key, value in iteritems(obj))
+    if isinstance(obj, (list, tuple)):
+        return [_stringify_keys(item) for item in obj]
+    return obj
+
+
+def canonical_json(obj):
+    """Serialize an object to JSON with sorted keys and no whitespace, so that
+    equal objects always produce the same string. Values that are not
+    JSON-serializable are represented by their ``repr``.
+    """
+    try:
+        return json.dumps(obj, sort_keys=True, separators=(',', ':'), default=repr)
+    except TypeError:
+        # Mixed key types (e.g. 200 and "default") can't be sorted
+        return json.dumps(_stringify_keys(obj), sort_keys=True, separators=(',', ':'),
+                          default=repr)
+
+
+def entry_hash(section, key, value):
+    """Return the hash of a spec entry as an `int`.
+
+    :param str section: Top-level section, e.g. ``"paths"``.
+    :param str key: Entry key within the section.
+    :param value: Entry value.
+    """
+    import hashlib
+    data = '\0'.join((section, str(key), canonical_json(value)))
+    return int(hashlib.sha1(data.encode('utf-8')).hexdigest(), 16)
+
+
+def _subschema_slots(schema):
+    """Yield ``(container, key)`` pairs locating the subschemas of a JSON Schema
+    object: its properties, items, additional properties and ``allOf`` members.
+    """
+    for name, prop in iteritems(schema.get('properties') or {}):
+        if isinstance(prop, dict):
+            yield schema['properties'], name
+    for key in ('items', 'additionalProperties'):
+        if isinstance(schema.get(key), dict):
+            yield schema, key
+    for index, member in enumerate(schema.get('allOf') or []):
+        if isinstance(member, dict):
+            yield schema['allOf'], index
+
+
+def _collect_refs(obj, refs):
+    """Add the values of all ``$ref`` keys found in an object to ``refs``."""
+    if isinstance(obj, dict):
+        for key, value in iteritems(obj):
+            if key == '$ref' and isinstance(value, basestring):
+                refs.add(value)
+            else:
+                _collect_refs(value, refs)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            _collect_refs(item, refs)
+    return refs
+
+
+def _parse_ref(ref):
+    """Return the ``(section, name)`` a local reference points to."""
+    section, _, name = ref.lstrip('#/').partition('/')
+    return section, name
+
+
+class _TimedPart(object):
+    """Deferred part of a definition, returned by a definition helper. Its
+    wall time is reported to ``stats`` as deferred work of the helper.
+    """
+    __slots__ = ('stats', 'helper', 'func')
+
+    def __init__(self, stats, helper, func):
+        self.stats = stats
+        self.helper = helper
+        self.func = func
+
+    def __call__(self):
+        start = default_timer()
+        try:
+            ret = self.func()
+        except Exception as error:
+            self.stats(helper_stats.DEFINITION_HELPER, self.helper, default_timer() - start,
+                       error, deferred=True)
+            raise
+        self.stats(helper_stats.DEFINITION_HELPER, self.helper, default_timer() - start,
+                   deferred=True)
+        return ret
+
+
+def _build_definition(parts, properties=None, enum=None):
+    """Combine the return values of definition helpers into a definition.
+    Callables, returned by helpers that defer their work, are called first.
+    """
+    ret = {}
+    for part in parts:
+        ret.update(part() if callable(part) else part)
+    if properties:
+        ret['properties'] = properties
+    if enum:
+        ret['enum'] = enum
+    return ret
+
+
+def _unchanged(old, new):
+    """Return whether a registered entry leaves the stored one as it is.
+    Values stored by reference, at any depth, may have been modified in place
+    since they were stored, so passing them again counts as a change.
+    """
+    if old is new:
+        return False
+    if old != new:
+        return False
+    stored = set(_container_ids(old))
+    return not any(container in stored for container in _container_ids(new))
+
+
+def _container_ids(obj):
+    """Yield the ids of the dicts and lists nested in ``obj``, including itself."""
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            yield id(obj)
+            stack.extend(itervalues(obj))
+        elif isinstance(obj, list):
+            yield id(obj)
+            stack.extend(obj)
+
+
+def merge_specs(specs):
+    """Merge specs into the first one. See `APISpec.merge`.
+
+    :param specs: Iterable of `APISpec` objects.
+    :return: The first spec, with all the others merged into it.
+    """
+    specs = iter(specs)
+    try:
+        merged = next(specs)
+    except StopIteration:
+        raise APISpecError('No specs to merge')
+    for spec in specs:
+        merged.merge(spec)
+    return merged
 
 
 class APISpec(object):
@@ -83,11 +362,40 @@ class APISpec(object):
     :param tuple plugins: Import paths to plugins.
     :param dict info: Optional dict to add to `info`
         See https://github.com/swagger-api/swagger-spec/blob/master/versions/2.0.md#infoObject
+    :param bool lazy_definitions: Defer the work of definition helpers that
+        support it (such as converting marshmallow schemas) until the spec is
+        serialized.
+    :param stats: Callable receiving the wall time of every helper call and
+        plugin setup, such as a `HelperStats <apispec.stats.HelperStats>`
+        object. See `apispec.stats`.
+    :param bool lazy_plugins: Set up each plugin in ``plugins`` that declares
+        ``TRIGGERS`` only when one of its trigger keyword arguments is first
+        passed to `add_path` or `definition`. See `apispec.plugins`.
+    :param bool discover_plugins: Also use the plugins declared by installed
+        distributions under the ``apispec.plugins`` entry point group, set
+        up lazily. See `apispec.plugins.discover`.
+    :param docstring_parser: Parser used by plugin helpers for the data in
+        view docstrings: ``"auto"`` (the default, JSON if valid, otherwise
+        YAML), ``"yaml"``, ``"json"``, the name of a parser registered with
+        `apispec.utils.register_docstring_parser`, or a parser function.
+    :param precompiled: Path of an artifact written by ``apispec-precompile``,
+        or a `PrecompiledOperations <apispec.precompile.PrecompiledOperations>`.
+        Plugin helpers read the operations of views from it instead of
+        parsing their docstrings, see `apispec.precompile`. It must have been
+        built with the same ``docstring_parser``.
+    :param bool thread_safe: Allow registering paths, definitions, parameters
+        and plugins from several threads at once. Each top-level section is
+        guarded by its own lock and paths are merged under a lock per path
+        template, so helpers run concurrently. `to_json`, `write` and
+        `fingerprint` see a consistent snapshot; objects returned by
+        `to_dict` must not be read while other threads register entries.
     :param **dict options: Optional top-level keys
         See https://github.com/swagger-api/swagger-spec/blob/master/versions/2.0.md#swagger-object
     """
 
-    def __init__(self, title, version, plugins=(), info=None, **options):
+    def __init__(self, title, version, plugins=(), info=None, lazy_definitions=False,
+                 thread_safe=False, stats=None, lazy_plugins=False, discover_plugins=False,
+                 docstring_parser=None, precompiled=None, **options):
         self.info = {
             'title': title,
             'version': version,
@@ -96,6 +404,9 @@ class APISpec(object):
         self.options = options
         # Metadata
         self._definitions = {}
+        # {'Pet': callable returning the definition}, see `lazy_definitions`
+        self._lazy_definitions = {}
+        self.lazy_definitions = lazy_definitions
         self._parameters = {}
         self._paths = {}
         # Plugin and helpers
@@ -104,20 +415,375 @@ class APISpec(object):
         self._path_helpers = []
         # {'get': {200: [my_helper]}}
         self._response_helpers = {}
+        # {my_helper: (required_kwargs, accepted_kwargs)}
+        self._helper_signatures = {}
+        # Helpers that can only be run by the *_async methods
+        self._coroutine_helpers = set()
+        # {'apispec.ext.flask': {'path': ['view']}}, plugins waiting for a trigger,
+        # in the order they were declared
+        self._deferred_plugins = OrderedDict()
+        # (json.dumps kwargs, serialized spec), reset whenever the spec changes
+        self._serialized = None
+        # {'paths': {'/pets': entry_hash}}, or None to rehash every entry
+        self._entry_hashes = None
+        # XOR of every entry hash
+        self._digest = 0
+        # (section, key) of entries changed since they were last hashed
+        self._stale_entries = set()
+        # {(section, key): references made by the entry}, or None to rebuild it
+        self._ref_graph = None
+        # (section, key) of entries changed since their references were collected
+        self._stale_refs = set()
+        self.thread_safe = thread_safe
+        self._init_locks()
+        self.stats = stats
+        if docstring_parser is not None:
+            from apispec.utils import get_docstring_parser
+            get_docstring_parser(docstring_parser)
+        self.docstring_parser = docstring_parser
+        if isinstance(precompiled, basestring):
+            from apispec.precompile import PrecompiledOperations
+            precompiled = PrecompiledOperations(precompiled)
+        if precompiled is not None:
+            from apispec.utils import get_docstring_parser
+            if get_docstring_parser(precompiled.parser) is not \
+                    get_docstring_parser(docstring_parser):
+                raise APISpecError(
+                    'Precompiled operations were parsed with the "{0}" docstring parser, '
+                    'not with the docstring_parser of the spec'.format(precompiled.parser)
+                )
+        self.precompiled = precompiled
 
+        if lazy_plugins or discover_plugins:
+            from apispec import plugins as plugin_discovery
         for plugin_path in plugins:
-            self.setup_plugin(plugin_path)
+            triggers = plugin_discovery.plugin_triggers(plugin_path) if lazy_plugins else None
+            self.setup_plugin(plugin_path, triggers=triggers)
+        if discover_plugins:
+            for plugin_path, triggers in iteritems(plugin_discovery.discover()):
+                self.setup_plugin(plugin_path, triggers=triggers)
 
-    def to_dict(self):
+    def _init_locks(self):
+        lock = threading.RLock if self.thread_safe else lambda: _NULL_LOCK
+        self._locks = dict((name, lock()) for name in LOCK_ORDER)
+        # {'/pets': lock}, guarded by the "paths" lock
+        self._path_locks = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_locks']
+        del state['_path_locks']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_locks()
+
+    @contextlib.contextmanager
+    def _locked(self, *names):
+        """Acquire the given locks in `LOCK_ORDER`."""
+        locks = [self._locks[name] for name in LOCK_ORDER if name in names]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    @contextlib.contextmanager
+    def _locked_paths(self, keys=None):
+        """Acquire the locks of the given path templates, or of all paths."""
+        if not self.thread_safe:
+            yield
+            return
+        with self._locks['paths']:
+            keys = sorted(self._paths if keys is None else keys)
+        locks = [self._path_lock(key) for key in keys]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _path_lock(self, key):
+        """Return the lock guarding the path object of a path template."""
+        if not self.thread_safe:
+            return _NULL_LOCK
+        with self._locks['paths']:
+            lock = self._path_locks.get(key)
+            if lock is None:
+                lock = self._path_locks[key] = threading.RLock()
+        return lock
+
+    def to_dict(self, prune=False):
+        """Return the spec as a `dict`.
+
+        :param bool prune: Leave out the definitions and parameters that can't
+            be reached by following references from ``paths``. Unreachable lazy
+            definitions are not computed.
+        """
+        with self._locked(*READ_LOCKS):
+            if not prune:
+                self._resolve_definitions()
+                return self._build_dict(self._definitions, self._parameters, self._paths)
+            return self._build_dict_with_refs(self._reachable_refs(), self._paths)
+
+    def _build_dict(self, definitions, parameters, paths):
         ret = {
             'swagger': SWAGGER_VERSION,
             'info': self.info,
+            'definitions': definitions,
+            'parameters': parameters,
+            'paths': paths,
+        }
+        ret.update(self.options)
+        return ret
+
+    def _build_dict_with_refs(self, refs, paths):
+        """Build the spec `dict` with only the definitions and parameters in ``refs``."""
+        definitions = dict(
+            (name, definition) for name, definition in iteritems(self._definitions)
+            if '#/definitions/' + name in refs
+        )
+        parameters = dict(
+            (name, parameter) for name, parameter in iteritems(self._parameters)
+            if '#/parameters/' + name in refs
+        )
+        return self._build_dict(definitions, parameters, paths)
+
+    def view(self, tags=None, path_prefix=None):
+        """Return a read-only view of the operations matching the given filters
+        and of the definitions and parameters they reference.
+
+        :param tags: Only include operations with one of these tags. A single
+            tag may be passed as a string.
+        :param str path_prefix: Only include paths starting with this prefix.
+        :rtype: SpecView
+        """
+        return SpecView(self, tags=tags, path_prefix=path_prefix)
+
+    def _reachable_refs(self, start=None):
+        """Return the references reachable from ``paths``, walking the reference
+        graph. Reached lazy definitions are computed.
+
+        :param set start: References to start from instead of those of ``paths``.
+        """
+        with self._locked(*READ_LOCKS):
+            sections = self._sections()
+            if self._ref_graph is None:
+                self._ref_graph = {}
+                self._stale_refs = set(
+                    (section, key) for section, entries in iteritems(sections) for key in entries
+                )
+
+            def refresh(section, key):
+                self._stale_refs.discard((section, key))
+                if key in sections[section]:
+                    self._ref_graph[section, key] = _collect_refs(sections[section][key], set())
+                else:
+                    self._ref_graph.pop((section, key), None)
+
+            for section, key in list(self._stale_refs):
+                refresh(section, key)
+
+            if start is None:
+                pending = set()
+                for key in self._paths:
+                    pending.update(self._ref_graph.get(('paths', key), ()))
+            else:
+                pending = set(start)
+            reachable = set()
+            while pending:
+                ref = pending.pop()
+                if ref in reachable:
+                    continue
+                reachable.add(ref)
+                section, name = _parse_ref(ref)
+                if section == 'definitions' and name in self._lazy_definitions:
+                    self._resolve_definitions([name])
+                    refresh(section, name)
+                pending.update(self._ref_graph.get((section, name), ()))
+            return reachable
+
+    def to_json(self, prune=False, **kwargs):
+        """Return the spec serialized as a JSON string.
+
+        The serialized document is cached and only regenerated after the spec
+        is modified through `add_path`, `definition`, `add_parameter` or `merge`,
+        so repeated calls with the same arguments are free. Changes made directly
+        to `info`, `options` or the returned objects are not tracked; call
+        `invalidate` after making them.
+
+        :param bool prune: See `to_dict`.
+        :param kwargs: Keyword arguments passed to `json.dumps`.
+        :rtype: str
+        """
+        key = (prune, kwargs)
+        with self._locked(*READ_LOCKS):
+            if self._serialized is None or self._serialized[0] != key:
+                self._serialized = (key, json.dumps(self.to_dict(prune=prune), **kwargs))
+            return self._serialized[1]
+
+    def write(self, fp, format='json', prune=False):
+        """Serialize the spec to a file-like object.
+
+        Entries of the ``paths``, ``definitions`` and ``parameters`` sections
+        are encoded and written one at a time, so the encoded document is never
+        held in memory as a whole.
+
+        :param fp: File-like object opened in text mode, e.g. with `open`. On
+            Python 2, native `str` objects are written to it, so it can't be
+            an `io.StringIO` or a file opened with `io.open`.
+        :param str format: Output format, either ``"json"`` or ``"yaml"``.
+        :param bool prune: See `to_dict`.
+        """
+        if format not in ('json', 'yaml'):
+            raise APISpecError('Unsupported output format: {0}'.format(format))
+        with self._locked(*READ_LOCKS):
+            if format == 'json':
+                self._write_json(fp, self.to_dict(prune=prune))
+            else:
+                self._write_yaml(fp, self.to_dict(prune=prune))
+
+    @staticmethod
+    def _write_json(fp, spec_dict):
+        fp.write('{')
+        for index, (key, value) in enumerate(iteritems(spec_dict)):
+            if index:
+                fp.write(', ')
+            fp.write(json.dumps(key) + ': ')
+            if key not in STREAMED_SECTIONS:
+                json.dump(value, fp)
+                continue
+            fp.write('{')
+            for entry_index, (entry_key, entry) in enumerate(iteritems(value)):
+                if entry_index:
+                    fp.write(', ')
+                fp.write(json.dumps(entry_key) + ': ')
+                json.dump(entry, fp)
+            fp.write('}')
+        fp.write('}')
+
+    @staticmethod
+    def _write_yaml(fp, spec_dict):
+        import yaml
+        dumper = get_spec_dumper()
+
+        def dump(obj):
+            return yaml.dump(obj, Dumper=dumper, default_flow_style=False)
+
+        for key, value in iteritems(spec_dict):
+            if key not in STREAMED_SECTIONS or not value:
+                fp.write(dump({key: value}))
+                continue
+            fp.write(key + ':\n')
+            for entry_key, entry in iteritems(value):
+                for line in dump({entry_key: entry}).splitlines(True):
+                    fp.write('  ' + line)
+
+    def fingerprint(self):
+        """Return a hex digest of the spec's contents, e.g. for use as an ETag.
+
+        A hash is kept for each path, definition and parameter and the
+        hashes are combined with XOR, so only entries that changed since the
+        previous call are rehashed. Changes made directly to registered objects
+        are not tracked; call `invalidate` after making them.
+
+        :rtype: str
+        """
+        import hashlib
+        with self._locked(*READ_LOCKS):
+            self._resolve_definitions()
+            sections = self._sections()
+            if self._entry_hashes is None:
+                self._entry_hashes = dict((section, {}) for section in STREAMED_SECTIONS)
+                self._digest = 0
+                self._stale_entries = set(
+                    (section, key) for section in STREAMED_SECTIONS for key in sections[section]
+                )
+            for section, key in self._stale_entries:
+                hashes = self._entry_hashes[section]
+                self._digest ^= hashes.pop(key, 0)
+                if key in sections[section]:
+                    hashes[key] = entry_hash(section, key, sections[section][key])
+                    self._digest ^= hashes[key]
+            self._stale_entries = set()
+            data = '\0'.join((
+                SWAGGER_VERSION,
+                '{0:040x}'.format(self._digest),
+                canonical_json(self.info),
+                canonical_json(self.options),
+            ))
+            return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def memory_report(self):
+        """Return the memory retained by each part of the spec, in bytes, as
+        measured by `apispec.stats.deep_sizeof`. Objects shared between parts
+        are counted in the first one. Helper functions and plugin modules are
+        not counted.
+
+        The keys are ``paths``, ``definitions``, ``lazy_definitions`` (not yet
+        computed), ``parameters``, ``plugins`` (plugin state and plugins
+        waiting for a trigger), ``helpers``
+        (helper registries and their signatures), ``caches`` (serialized spec,
+        hashes and reference graph), ``docstring_cache`` (the parsed docstrings
+        in `apispec.utils.docstring_cache`, which is shared by all specs) and
+        ``total``. ``docstring_cache_entries`` is the number of docstrings in
+        that cache, and is not part of the total.
+
+        :rtype: dict
+        """
+        from apispec.utils import docstring_cache
+        with self._locked('plugins', *READ_LOCKS):
+            parts = (
+                ('paths', self._paths),
+                ('definitions', self._definitions),
+                ('lazy_definitions', self._lazy_definitions),
+                ('parameters', self._parameters),
+                ('plugins', (self.plugins, self._deferred_plugins)),
+                ('helpers', (
+                    self._path_helpers, self._definition_helpers, self._response_helpers,
+                    self._helper_signatures, self._coroutine_helpers,
+                )),
+                ('caches', (
+                    self._serialized, self._entry_hashes, self._stale_entries,
+                    self._ref_graph, self._stale_refs,
+                )),
+            )
+            seen = set()
+            report = dict((name, helper_stats.deep_sizeof(obj, seen)) for name, obj in parts)
+        with docstring_cache._lock:
+            report['docstring_cache'] = helper_stats.deep_sizeof(docstring_cache._entries, seen)
+            entries = len(docstring_cache)
+        report['total'] = sum(itervalues(report))
+        report['docstring_cache_entries'] = entries
+        return report
+
+    def _sections(self):
+        return {
             'definitions': self._definitions,
             'parameters': self._parameters,
             'paths': self._paths,
         }
-        ret.update(self.options)
-        return ret
+
+    def _touch(self, section, key):
+        """Record that an entry of the spec was added or changed."""
+        with self._locks['state']:
+            self._serialized = None
+            self._stale_entries.add((section, key))
+            self._stale_refs.add((section, key))
+
+    def invalidate(self):
+        """Discard the cached serialization returned by `to_json`, the entry
+        hashes used by `fingerprint` and the reference graph used for pruning.
+        """
+        with self._locks['state']:
+            self._serialized = None
+            self._entry_hashes = None
+            self._ref_graph = None
 
     def add_parameter(self, param_id, location, **kwargs):
         """ Add a parameter which can be referenced.
@@ -129,75 +795,578 @@ class APISpec(object):
         if 'name' not in kwargs:
             kwargs['name'] = param_id
         kwargs['in'] = location
-        self._parameters[param_id] = kwargs
+        with self._locks['parameters']:
+            if _unchanged(self._parameters.get(param_id), kwargs):
+                return
+            self._parameters[param_id] = kwargs
+            self._touch('parameters', param_id)
 
     def add_path(self, path=None, operations=None, **kwargs):
         """Add a new path object to the spec.
 
         https://github.com/swagger-api/swagger-spec/blob/master/versions/2.0.md#paths-object-
         """
-        if path and 'basePath' in self.options:
-            pattern = '^{0}'.format(re.escape(self.options['basePath']))
-            path = re.sub(pattern, '', path)
+        self._setup_triggered_plugins('path', kwargs)
+        self._add_path(self._path_context(), path=path, operations=operations, **kwargs)
+
+    def add_path_async(self, path=None, operations=None, **kwargs):
+        """Coroutine version of `add_path`, for specs with coroutine helpers.
+        Helpers that return awaitables run concurrently. Requires Python 3.5+. ::
+
+            await spec.add_path_async(view=pet_view)
+        """
+        from apispec import aio
+        return aio.add_path(self, path=path, operations=operations, **kwargs)
+
+    def add_paths(self, paths):
+        """Add multiple path objects to the spec. Equivalent to calling `add_path`
+        for each item, but the base path pattern and helper lookups are computed
+        only once for the whole batch. Each path is still built by the helpers
+        and stored on its own, so this is only about 10-25% faster than calling
+        `add_path` in a loop.
+
+        :param paths: Iterable of `dict` objects holding the keyword arguments
+            to pass to `add_path`.
+        """
+        context = self._path_context()
+        for path_kwargs in paths:
+            if self._setup_triggered_plugins('path', path_kwargs):
+                context = self._path_context()
+            self._add_path(context, **path_kwargs)
+
+    def add_paths_async(self, paths):
+        """Coroutine version of `add_paths`. The helpers of all paths run
+        concurrently; paths are stored in the order they were passed once
+        all helpers have finished. Requires Python 3.5+.
+        """
+        from apispec import aio
+        return aio.add_paths(self, paths)
+
+    def _path_context(self):
+        """Return the state shared by every `add_path` call until a helper
+        or the ``basePath`` option changes.
+        """
+        base_path = self.options.get('basePath')
+        base_path_re = re.compile('^' + re.escape(base_path)) if base_path else None
+        with self._locks['plugins']:
+            path_helpers = [
+                (func, self._helper_signatures.get(func)) for func in self._path_helpers
+            ]
+            return base_path_re, path_helpers, set(iterkeys(self._response_helpers))
+
+    def _add_path(self, context, path=None, operations=None, **kwargs):
+        if self._direct_helpers():
+            self._store_path(self._build_path_direct(
+                context, path=path, operations=operations, **kwargs
+            ))
+            return
+        self._store_path(self._run_helpers(
+            self._path_steps(context, path=path, operations=operations, **kwargs)
+        ))
+
+    def _run_helpers(self, steps):
+        """Run the helper calls requested by a generator returned by
+        `_path_steps` or `_definition_steps` and return its last value.
+
+        The generator yields `HelperCalls` and is sent the list of their return
+        values, until it yields its result.
+        """
+        step = next(steps)
+        while isinstance(step, HelperCalls):
+            results = []
+            for func, args, kwargs in step:
+                if func in self._coroutine_helpers:
+                    raise APISpecError(
+                        'Helper {0!r} is a coroutine function. '
+                        'Use the *_async methods of APISpec.'.format(func)
+                    )
+                if self.stats is None:
+                    results.append(func(*args, **kwargs))
+                else:
+                    results.append(self._timed(step.kind, func, func, *args, **kwargs))
+            step = steps.send(results)
+        steps.close()
+        return step
+
+    def _timed(self, kind, target, func, *args, **kwargs):
+        """Call ``func`` and report its wall time to ``stats``."""
+        start = default_timer()
+        try:
+            ret = func(*args, **kwargs)
+        except Exception as error:
+            self.stats(kind, target, default_timer() - start, error)
+            raise
+        self.stats(kind, target, default_timer() - start)
+        return ret
+
+    def _path_steps(self, context, path=None, operations=None, **kwargs):
+        """Generator building a `Path` with the path and response helpers.
+        See `_run_helpers`.
+        """
+        base_path_re, path_helpers, response_methods = context
+        if path and base_path_re:
+            path = base_path_re.sub('', path)
         path = Path(path=path, operations=operations)
-        # Execute plugins' helpers
-        for func in self._path_helpers:
-            try:
-                ret = func(
-                    self, path=path, operations=operations, **kwargs
-                )
-            except TypeError:
-                continue
+        helper_kwargs = dict(kwargs, path=path, operations=operations)
+        results = yield self._path_helper_calls(path_helpers, helper_kwargs)
+        for ret in results:
             if isinstance(ret, Path):
                 path.update(ret)
 
         if not path.path:
             raise APISpecError('Path template is not specified')
 
+        targets = self._response_targets(path, response_methods)
+        if targets:
+            results = yield HelperCalls(
+                helper_stats.RESPONSE_HELPER, ((func, (self, ), kwargs) for _, func in targets)
+            )
+            for (response, _), ret in zip(targets, results):
+                response.update(ret)
+        yield path
+
+    def _build_path_direct(self, context, path=None, operations=None, **kwargs):
+        """Fast path of `_path_steps`, calling the helpers directly and
+        returning the `Path`. See `_direct_helpers`.
+        """
+        base_path_re, path_helpers, response_methods = context
+        if path and base_path_re:
+            path = base_path_re.sub('', path)
+        path = Path(path=path, operations=operations)
+        if path_helpers:
+            helper_kwargs = dict(kwargs, path=path, operations=operations)
+            for func, args, func_kwargs in self._path_helper_calls(path_helpers, helper_kwargs):
+                ret = func(*args, **func_kwargs)
+                if isinstance(ret, Path):
+                    path.update(ret)
+
+        if not path.path:
+            raise APISpecError('Path template is not specified')
+
+        if response_methods:
+            for response, func in self._response_targets(path, response_methods):
+                response.update(func(self, **kwargs))
+        return path
+
+    def _response_targets(self, path, response_methods):
+        """Return the ``(response, helper)`` pairs of the response helpers to
+        run on a path's operations.
+        """
         # Process response helpers for any path operations defined.
         # Rule is that method + http status exist in both operations and helpers
-        methods = set(iterkeys(path.operations)) & set(iterkeys(self._response_helpers))
+        methods = set(iterkeys(path.operations)) & response_methods
+        targets = []
         for method in methods:
             responses = path.operations[method]['responses']
             statuses = set(iterkeys(responses)) & set(iterkeys(self._response_helpers[method]))
             for status_code in statuses:
                 for func in self._response_helpers[method][status_code]:
-                    responses[status_code].update(
-                        func(self, **kwargs)
-                    )
+                    targets.append((responses[status_code], func))
+        return targets
 
-        self._paths.setdefault(path.path, path).update(path)
+    def _path_helper_calls(self, path_helpers, helper_kwargs):
+        """Return the calls of the path helpers whose signature matches the arguments."""
+        calls = HelperCalls(helper_stats.PATH_HELPER)
+        for func, signature in path_helpers:
+            func_kwargs = _match_helper(signature, helper_kwargs)
+            if func_kwargs is not None:
+                calls.append((func, (self, ), func_kwargs))
+        return calls
+
+    def _store_path(self, path):
+        if self.thread_safe:
+            # Copy on write, so that readers never see a path being updated
+            with self._path_lock(path.path):
+                stored = self._paths.get(path.path)
+                if stored is not None:
+                    if self._path_unchanged(stored, path):
+                        return
+                    merged = Path(path=path.path)
+                    merged.update(stored)
+                    merged.update(path)
+                    path = merged
+                with self._locks['paths']:
+                    self._paths[path.path] = path
+        else:
+            stored = self._paths.get(path.path)
+            if stored is None:
+                self._paths[path.path] = path
+            elif self._path_unchanged(stored, path):
+                return
+            else:
+                stored.update(path)
+        self._touch('paths', path.path)
+
+    @staticmethod
+    def _path_unchanged(stored, path):
+        return all(
+            _unchanged(stored.get(method), operation) for method, operation in iteritems(path)
+            if method in _VALID_METHODS
+        )
 
     def definition(self, name, properties=None, enum=None, **kwargs):
         """Add a new definition to the spec.
 
         https://github.com/swagger-api/swagger-spec/blob/master/versions/2.0.md#definitionsObject
         """
-        ret = {}
-        # Execute all helpers from plugins
-        for func in self._definition_helpers:
+        self._setup_triggered_plugins('definition', kwargs)
+        if self._direct_helpers():
+            signatures = self._helper_signatures
+            helpers = ((func, signatures.get(func)) for func in self._definition_helpers)
+            self._definition_direct(helpers, name, properties, enum, kwargs)
+            return
+        self._definition(self._definition_context(), name,
+                         properties=properties, enum=enum, **kwargs)
+
+    def definition_async(self, name, properties=None, enum=None, **kwargs):
+        """Coroutine version of `definition`, for specs with coroutine
+        helpers. Requires Python 3.5+.
+        """
+        from apispec import aio
+        return aio.definition(self, name, properties=properties, enum=enum, **kwargs)
+
+    def definitions(self, definitions):
+        """Add multiple definitions to the spec. Equivalent to calling `definition`
+        for each item.
+
+        :param definitions: Iterable of `dict` objects holding the keyword arguments
+            to pass to `definition`, including ``name``.
+        """
+        helpers = self._definition_context()
+        for definition_kwargs in definitions:
+            if self._setup_triggered_plugins('definition', definition_kwargs):
+                helpers = self._definition_context()
+            self._definition(helpers, **definition_kwargs)
+
+    def definitions_async(self, definitions):
+        """Coroutine version of `definitions`. The helpers of all definitions
+        run concurrently. Requires Python 3.5+.
+        """
+        from apispec import aio
+        return aio.definitions(self, definitions)
+
+    def _definition_context(self):
+        signatures = self._helper_signatures
+        if not self.thread_safe:
+            return [(func, signatures.get(func)) for func in self._definition_helpers]
+        with self._locks['plugins']:
+            return [(func, signatures.get(func)) for func in self._definition_helpers]
+
+    def _definition(self, helpers, name, properties=None, enum=None, **kwargs):
+        if self._direct_helpers():
+            self._definition_direct(helpers, name, properties, enum, kwargs)
+            return
+        self._store_definition(name, self._run_helpers(
+            self._definition_steps(helpers, name, **kwargs)
+        ), properties, enum)
+
+    def _direct_helpers(self):
+        """Return whether helpers can be called directly, i.e. without the
+        bookkeeping needed for stats, locks and coroutine helpers.
+        """
+        return self.stats is None and not self.thread_safe and not self._coroutine_helpers
+
+    def _definition_direct(self, helpers, name, properties, enum, kwargs):
+        """Fast path of `_definition`, see `_direct_helpers`."""
+        parts = []
+        for func, signature in helpers:
+            func_kwargs = _match_helper(signature, kwargs)
+            if func_kwargs is not None:
+                parts.append(func(self, name, **func_kwargs))
+        if self.lazy_definitions:
+            self._store_definition(name, parts, properties, enum)
+            return
+        definition = _build_definition(parts, properties, enum)
+        if name in self._definitions and _unchanged(self._definitions[name], definition):
+            return
+        self._definitions[name] = definition
+        self._serialized = None
+        self._stale_entries.add(('definitions', name))
+        self._stale_refs.add(('definitions', name))
+
+    def _definition_steps(self, helpers, name, **kwargs):
+        """Generator collecting the return values of the definition helpers.
+        See `_run_helpers`.
+        """
+        # Execute plugins' helpers whose signature matches the arguments
+        calls = HelperCalls(helper_stats.DEFINITION_HELPER)
+        for func, signature in helpers:
+            func_kwargs = _match_helper(signature, kwargs)
+            if func_kwargs is not None:
+                calls.append((func, (self, name), func_kwargs))
+        parts = yield calls
+        if self.stats is not None:
+            parts = [
+                _TimedPart(self.stats, func, part) if callable(part) else part
+                for (func, _, _), part in zip(calls, parts)
+            ]
+        yield parts
+
+    def _store_definition(self, name, parts, properties=None, enum=None):
+        if self.lazy_definitions:
+            build = functools.partial(_build_definition, parts, properties, enum)
+            with self._locks['definitions']:
+                self._definitions.pop(name, None)
+                self._lazy_definitions[name] = build
+                self._touch('definitions', name)
+        else:
+            definition = _build_definition(parts, properties, enum)
+            with self._locks['definitions']:
+                if _unchanged(self._definitions.get(name), definition):
+                    return
+                self._definitions[name] = definition
+                self._touch('definitions', name)
+
+    def _resolve_definitions(self, names=None):
+        """Compute lazy definitions and store them with the others.
+
+        :param names: Names of the definitions to compute. Defaults to all of them.
+        """
+        pending = self._lazy_definitions
+        if not pending:
+            return
+        with self._locks['definitions']:
+            names = list(pending) if names is None else [name for name in names if name in pending]
+            for name in names:
+                # Only dropped once built, so that a failing build is retried
+                self._definitions[name] = pending[name]()
+                del pending[name]
+                with self._locks['state']:
+                    self._stale_refs.add(('definitions', name))
+
+    def resolve_ref(self, ref):
+        """Return the definition or parameter a local reference points to.
+        A lazy definition is computed the first time it is resolved.
+
+        :param str ref: The reference, e.g. ``"#/definitions/Pet"``.
+        :raise: APISpecError if the reference can't be resolved.
+        """
+        section, name = _parse_ref(ref)
+        if section == 'definitions':
+            self._resolve_definitions([name])
+        sections = self._sections()
+        if section not in ('definitions', 'parameters') or name not in sections[section]:
+            raise APISpecError('Could not resolve reference {0}'.format(ref))
+        return sections[section][name]
+
+    def _schema_slots(self):
+        """Yield ``(container, key)`` pairs locating the top-level schemas of
+        response objects and body parameters.
+        """
+        parameters = list(itervalues(self._parameters))
+        for path in itervalues(self._paths):
+            for operation in itervalues(path):
+                for response in itervalues(operation.get('responses') or {}):
+                    if isinstance(response, dict) and isinstance(response.get('schema'), dict):
+                        yield response, 'schema'
+                parameters.extend(operation.get('parameters') or [])
+        for parameter in parameters:
+            if isinstance(parameter.get('schema'), dict):
+                yield parameter, 'schema'
+
+    def hoist_inline_schemas(self, min_count=2, prefix='InlineSchema'):
+        """Move object schemas that are repeated inline into ``definitions``
+        and replace them with references.
+
+        Object schemas (i.e. those with ``properties``) found in responses,
+        body parameters and definitions, at any depth, are compared by
+        structure. Those found ``min_count`` times or more become definitions
+        named after their ``title``, or ``prefix`` followed by a number. Inline
+        schemas identical to an existing definition always become references
+        to it.
+
+        :param int min_count: Number of identical copies from which a schema is
+            hoisted.
+        :param str prefix: Prefix of the generated definition names.
+        :return: A `dict` of the definitions that were added.
+        """
+        with self._locked_paths(), self._locked(*READ_LOCKS):
+            self._resolve_definitions()
+            counts = {}
+            # {id(schema): (schema, canonical JSON)}, computed before any schema
+            # is rewritten since a schema object may be reachable from several slots
+            keys = {}
+            # {canonical JSON: definition name}
+            names = dict(
+                (canonical_json(definition), name)
+                for name, definition in iteritems(self._definitions)
+            )
+
+            def count(schema):
+                if id(schema) not in keys:
+                    keys[id(schema)] = (schema, canonical_json(schema))
+                key = keys[id(schema)][1]
+                counts[key] = counts.get(key, 0) + 1
+                for container, slot in _subschema_slots(schema):
+                    count(container[slot])
+
+            def hoist(container, slot, is_definition=False):
+                schema = container[slot]
+                key = keys[id(schema)][1]
+                if id(schema) not in visited:
+                    visited.add(id(schema))
+                    for child_container, child_slot in _subschema_slots(schema):
+                        hoist(child_container, child_slot)
+                if is_definition or 'properties' not in schema:
+                    return
+                if key not in names:
+                    if counts[key] < min_count:
+                        return
+                    name = schema.get('title')
+                    if not name or name in self._definitions:
+                        name = next(
+                            candidate for candidate in (
+                                '{0}{1}'.format(prefix, number) for number in itertools.count(1)
+                            ) if candidate not in self._definitions
+                        )
+                    names[key] = name
+                    self._definitions[name] = hoisted[name] = schema
+                container[slot] = {'$ref': '#/definitions/' + names[key]}
+
+            hoisted = {}
+            visited = set()
+            slots = list(self._schema_slots())
+            for container, slot in slots:
+                count(container[slot])
+            for definition in itervalues(self._definitions):
+                count(definition)
             try:
-                ret.update(func(self, name, **kwargs))
-            except TypeError:
-                continue
-        if properties:
-            ret['properties'] = properties
-        if enum:
-            ret['enum'] = enum
-        self._definitions[name] = ret
+                for name in list(self._definitions):
+                    hoist(self._definitions, name, is_definition=True)
+                for container, slot in slots:
+                    hoist(container, slot)
+            finally:
+                self.invalidate()
+            return hoisted
+
+    def merge(self, other):
+        """Merge the paths, definitions and parameters of another spec into this one.
+        Useful for combining partial specs built in separate processes.
+
+        Operations of paths present in both specs are combined. Options and
+        plugins (including their state) of ``other`` that are missing from this
+        spec are copied over. Helpers registered on ``other`` outside of a plugin
+        are not.
+
+        :param APISpec other: The spec to merge into this one.
+        :raise: APISpecError if both specs define the same definition, parameter
+            or path operation with different values. This spec is left unchanged.
+        :return: This spec.
+        """
+        # Snapshot the other spec first, so that this spec's locks are never
+        # held while waiting for the other's, e.g. if it is merging this one
+        with other._locked('plugins', *READ_LOCKS):
+            other._resolve_definitions()
+            definitions = dict(other._definitions)
+            parameters = dict(other._parameters)
+            paths = {}
+            for key, path in iteritems(other._paths):
+                paths[key] = Path(path=key)
+                paths[key].update(path)
+            options = dict(other.options)
+            deferred_plugins = OrderedDict(other._deferred_plugins)
+            plugins = dict((path, dict(state)) for path, state in iteritems(other.plugins))
+
+        with self._locked('plugins'), self._locked_paths(paths), self._locked(*READ_LOCKS):
+            self._resolve_definitions()
+            conflicts = []
+            for section, ours, theirs in (('definitions', self._definitions, definitions),
+                                          ('parameters', self._parameters, parameters)):
+                conflicts.extend(
+                    '{0} "{1}"'.format(section, key) for key, value in iteritems(theirs)
+                    if key in ours and ours[key] != value
+                )
+            for key, path in iteritems(paths):
+                ours = self._paths.get(key, {})
+                conflicts.extend(
+                    'operation "{0} {1}"'.format(method.upper(), key)
+                    for method, operation in iteritems(path)
+                    if method in ours and ours[method] != operation
+                )
+            if conflicts:
+                raise APISpecError(
+                    'Cannot merge conflicting {0}'.format(', '.join(sorted(conflicts)))
+                )
+
+            for section, entries in (('definitions', definitions),
+                                     ('parameters', parameters), ('paths', paths)):
+                for key in entries:
+                    self._touch(section, key)
+            self._definitions.update(definitions)
+            self._parameters.update(parameters)
+            for key, path in iteritems(paths):
+                stored = self._paths.get(key)
+                if stored is None:
+                    self._paths[key] = path
+                elif self.thread_safe:
+                    merged = Path(path=key)
+                    merged.update(stored)
+                    merged.update(path)
+                    self._paths[key] = merged
+                else:
+                    stored.update(path)
+            for key, value in iteritems(options):
+                self.options.setdefault(key, value)
+            for plugin_path, triggers in iteritems(deferred_plugins):
+                self.setup_plugin(plugin_path, triggers=triggers)
+            for plugin_path, state in iteritems(plugins):
+                self.setup_plugin(plugin_path)
+                plugin = self.plugins[plugin_path]
+                for key, value in iteritems(state):
+                    if isinstance(value, dict) and isinstance(plugin.get(key), dict):
+                        plugin[key].update(value)
+                    else:
+                        plugin.setdefault(key, value)
+            return self
 
     # PLUGIN INTERFACE
 
     # adapted from Sphinx
-    def setup_plugin(self, path):
+    def setup_plugin(self, path, triggers=None):
         """Import and setup a plugin. No-op if called twice
         for the same plugin.
 
         :param str name: Import path to the plugin.
+        :param dict triggers: Defer the plugin's setup until one of these
+            keyword arguments is passed to `add_path` (key ``"path"``) or
+            `definition` (key ``"definition"``), e.g. ``{'path': ['view']}``.
         :raise: PluginError if the given plugin is invalid.
         """
-        if path in self.plugins:
-            return
+        with self._locks['plugins']:
+            if path in self.plugins:
+                return
+            if triggers is not None:
+                self._deferred_plugins.setdefault(path, triggers)
+                return
+            if self.stats is not None:
+                return self._timed(helper_stats.PLUGIN, path, self._setup_plugin, path)
+            return self._setup_plugin(path)
+
+    def _setup_triggered_plugins(self, kind, kwargs):
+        """Set up the deferred plugins triggered by the keyword arguments of a
+        call to `add_path` (``kind`` is ``"path"``) or `definition`.
+
+        Helpers run in the order their plugins were set up, so the deferred
+        plugins declared before a triggered one are set up along with it.
+
+        :return: `True` if any plugin was set up.
+        """
+        if not self._deferred_plugins:
+            return False
+        with self._locks['plugins']:
+            deferred = list(iteritems(self._deferred_plugins))
+            triggered = [
+                index for index, (path, triggers) in enumerate(deferred)
+                if not set(triggers.get(kind, ())).isdisjoint(kwargs)
+            ]
+            if not triggered:
+                return False
+            for path, _ in deferred[:triggered[-1] + 1]:
+                del self._deferred_plugins[path]
+                self.setup_plugin(path)
+        return True
+
+    def _setup_plugin(self, path):
         try:
             mod = __import__(
                 path, globals=None, locals=None, fromlist=('setup', )
@@ -219,15 +1388,28 @@ class APISpec(object):
         - Receive the `APISpec` instance as the first argument.
         - Receive the definition `name` as the second argument.
         - Include ``**kwargs`` in its signature.
-        - Return a `dict` representation of the definition's Schema object.
+        - Return a `dict` representation of the definition's Schema object, or a
+          callable taking no arguments that returns it. A callable is only called
+          when the definition is needed if the spec has ``lazy_definitions``
+          enabled.
+
+        The helper may be a coroutine function, in which case definitions must
+        be added with `definition_async` or `definitions_async`.
 
         The helper may define any named arguments after the `name` argument.
+        It is only called when all of its arguments without a default value
+        are passed to `definition`.
 
         https://github.com/swagger-api/swagger-spec/blob/master/versions/2.0.md#definitionsObject
 
         :param callable func: The definition helper function.
         """
-        self._definition_helpers.append(func)
+        signature = _inspect_helper(func, 2)
+        with self._locks['plugins']:
+            self._helper_signatures[func] = signature
+            self._definition_helpers.append(func)
+            if iscoroutinefunction(func):
+                self._coroutine_helpers.add(func)
 
     def register_path_helper(self, func):
         """Register a new path helper. The helper **must** meet the following conditions:
@@ -236,9 +1418,19 @@ class APISpec(object):
         - Include ``**kwargs`` in signature.
         - Return a `apispec.core.Path` object.
 
-        The helper may define any named arguments in its signature.
+        The helper may define any named arguments in its signature. It is only
+        called when all of its arguments without a default value are passed to
+        `add_path`; ``path`` and ``operations`` are always passed.
+
+        The helper may be a coroutine function, in which case paths must be
+        added with `add_path_async` or `add_paths_async`.
         """
-        self._path_helpers.append(func)
+        signature = _inspect_helper(func, 1)
+        with self._locks['plugins']:
+            self._helper_signatures[func] = signature
+            self._path_helpers.append(func)
+            if iscoroutinefunction(func):
+                self._coroutine_helpers.add(func)
 
     def register_response_helper(self, func, method, status_code):
         """Register a new response helper. The helper **must** meet the following conditions:
@@ -247,9 +1439,78 @@ class APISpec(object):
         - Include ``**kwargs`` in signature.
         - Return a `dict` response object.
 
-        The helper may define any named arguments in its signature.
+        The helper may define any named arguments in its signature. It may be a
+        coroutine function, in which case paths must be added with
+        `add_path_async` or `add_paths_async`.
         """
         method = method.lower()
-        if method not in self._response_helpers:
-            self._response_helpers[method] = {}
-        self._response_helpers[method].setdefault(status_code, []).append(func)
+        with self._locks['plugins']:
+            if method not in self._response_helpers:
+                self._response_helpers[method] = {}
+            self._response_helpers[method].setdefault(status_code, []).append(func)
+            if iscoroutinefunction(func):
+                self._coroutine_helpers.add(func)
+
+
+class SpecView(object):
+    """Read-only view of part of an `APISpec`, returned by `APISpec.view`.
+
+    The view is computed from the spec whenever it is serialized, so it
+    reflects later changes to the spec. Nothing is copied: the serialized view
+    shares its operations, definitions and parameters with the spec, so they
+    must not be modified.
+
+    :param APISpec spec: The spec to view.
+    :param tags: Only include operations with one of these tags. A single
+        tag may be passed as a string.
+    :param str path_prefix: Only include paths starting with this prefix.
+    """
+
+    def __init__(self, spec, tags=None, path_prefix=None):
+        self.spec = spec
+        if isinstance(tags, basestring):
+            tags = (tags, )
+        self.tags = frozenset(tags) if tags is not None else None
+        self.path_prefix = path_prefix
+
+    def _matches(self, operation):
+        if self.tags is None:
+            return True
+        return not self.tags.isdisjoint(operation.get('tags') or ())
+
+    def _paths(self):
+        paths = {}
+        for key, path in iteritems(self.spec._paths):
+            if self.path_prefix and not key.startswith(self.path_prefix):
+                continue
+            operations = dict(
+                (method, operation) for method, operation in iteritems(path)
+                if self._matches(operation)
+            )
+            if len(operations) == len(path):
+                paths[key] = path
+            elif operations:
+                paths[key] = operations
+        return paths
+
+    def to_dict(self):
+        with self.spec._locked(*READ_LOCKS):
+            paths = self._paths()
+            refs = _collect_refs(paths, set())
+            return self.spec._build_dict_with_refs(self.spec._reachable_refs(refs), paths)
+
+    def to_json(self, **kwargs):
+        """Return the view serialized as a JSON string.
+
+        :param kwargs: Keyword arguments passed to `json.dumps`.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def write(self, fp, format='json'):
+        """Serialize the view to a file-like object. See `APISpec.write`."""
+        if format == 'json':
+            APISpec._write_json(fp, self.to_dict())
+        elif format == 'yaml':
+            APISpec._write_yaml(fp, self.to_dict())
+        else:
+            raise APISpecError('Unsupported output format: {0}'.format(format))
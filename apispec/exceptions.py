@@ -12,3 +12,7 @@ class PluginError(APISpecError):
 class SwaggerError(APISpecError):
     """Raised when a swagger validation fails"""
     pass
+
+class DocstringWarning(UserWarning):
+    """Warning issued when the data in a docstring cannot be parsed."""
+    pass
@@ -5,14 +5,13 @@ function to `add_path`.
 from __future__ import absolute_import
 import re
 
-from flask import current_app
-
 from apispec.compat import iteritems
 from apispec import Path
 from apispec.exceptions import APISpecError
 from apispec import utils
 
 def _rule_for_view(view):
+    from flask import current_app
     view_funcs = current_app.view_functions
     endpoint = None
     for ep, view_func in iteritems(view_funcs):
@@ -36,13 +35,20 @@ def flaskpath2swagger(path):
     return RE_URL.sub(r'{\1}', path)
 
 def path_from_view(spec, view, operations, **kwargs):
-    """Path helper that allows passing a Flask view function."""
+    """Path helper that allows passing a Flask view function. Operations are
+    parsed from the view's docstring unless ``operations`` is passed.
+    """
     rule = _rule_for_view(view)
     path = flaskpath2swagger(rule.rule)
-    operations = utils.load_operations_from_docstring(view.__doc__)
+    if operations is None:
+        operations = utils.load_operations_from_view(
+            view, parser=spec.docstring_parser, precompiled=spec.precompiled)
     path = Path(path=path, operations=operations)
     return path
 
+# Set up the plugin lazily when add_path is passed a view, see `apispec.plugins`
+TRIGGERS = {'path': ['view']}
+
 def setup(spec):
     """Setup for the plugin."""
     spec.register_path_helper(path_from_view)
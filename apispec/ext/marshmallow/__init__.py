@@ -3,15 +3,13 @@
 `Schema` to `APISpec.definition <apispec.APISpec.definition>`
 and `APISpec.add_path <apispec.APISpec.add_path>` (for responses).
 
-Requires marshmallow>=1.2.
+Requires marshmallow>=1.2. marshmallow is imported when a helper first needs it.
 """
 from __future__ import absolute_import
-
-import marshmallow
+import functools
 
 from apispec.core import Path
-from apispec.utils import load_operations_from_docstring
-from . import swagger
+from apispec.utils import load_operations_from_view
 
 NAME = 'apispec.ext.marshmallow'
 
@@ -27,16 +25,18 @@ def schema_definition_helper(spec, name, schema, **kwargs):
     if 'refs' not in plug:
         plug['refs'] = {}
     plug['refs'][schema] = name
-    return swagger.schema2jsonschema(schema, spec=spec)
+    from . import swagger
+    # Deferred, so that specs with lazy definitions only convert referenced schemas
+    return functools.partial(swagger.schema2jsonschema, schema, spec=spec)
 
-def schema_path_helper(spec, view, **kwargs):
+def schema_path_helper(spec, view, operations=None, **kwargs):
     """Path helper that allows passing a Schema as a response. Responses can be
-    defined in a view's docstring.
+    defined in a view's docstring, which is only parsed if ``operations`` is
+    not passed.
     """
-    operations = (
-        load_operations_from_docstring(view.__doc__) or
-        kwargs.get('operations')
-    )
+    if operations is None:
+        operations = load_operations_from_view(
+            view, parser=spec.docstring_parser, precompiled=spec.precompiled)
     if not operations:
         return
     operations = operations.copy()
@@ -49,19 +49,24 @@ def schema_path_helper(spec, view, **kwargs):
 def resolve_schema_dict(spec, schema, dump=True):
     if isinstance(schema, dict):
         return schema
-    plug = spec.plugins[NAME] if spec else {}
+    plug = spec.plugins.get(NAME, {}) if spec else {}
     schema_cls = resolve_schema_cls(schema)
     if schema_cls in plug.get('refs', {}):
         return {'$ref': '#/definitions/{0}'.format(plug['refs'][schema_cls])}
+    from . import swagger
     return swagger.schema2jsonschema(schema_cls, spec=spec, dump=dump)
 
 def resolve_schema_cls(schema):
+    import marshmallow
     if isinstance(schema, type) and issubclass(schema, marshmallow.Schema):
         return schema
     if isinstance(schema, marshmallow.Schema):
         return type(schema)
     return marshmallow.class_registry.get_class(schema)
 
+# Set up the plugin lazily when a schema or view is passed, see `apispec.plugins`
+TRIGGERS = {'path': ['view'], 'definition': ['schema']}
+
 def setup(spec):
     """Setup for the marshmallow plugin."""
     spec.register_definition_helper(schema_definition_helper)
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Discovery of plugins installed as package entry points.
+
+A distribution provides plugins by declaring entry points in the
+``apispec.plugins`` group, each naming a plugin module: ::
+
+    setup(
+        ...
+        entry_points={
+            'apispec.plugins': ['tornado = apispec_tornado'],
+        },
+    )
+
+A plugin module may declare the keyword arguments that make its helpers
+useful in a ``TRIGGERS`` mapping. Such a plugin is only imported and set up
+when one of them is passed to `add_path <apispec.APISpec.add_path>` (key
+``"path"``) or `definition <apispec.APISpec.definition>` (key
+``"definition"``): ::
+
+    TRIGGERS = {'path': ['handler']}
+
+The triggers of discovered plugins are stored in an index file, so that
+plugin modules are only imported again when their distribution's version
+changes.
+"""
+import os
+import json
+import tempfile
+
+from apispec.compat import iteritems
+from apispec.exceptions import PluginError
+
+ENTRY_POINT_GROUP = 'apispec.plugins'
+# Default location of the index, overridden by the APISPEC_PLUGIN_INDEX
+# environment variable
+DEFAULT_INDEX = os.path.join('~', '.cache', 'apispec', 'plugins.json')
+INDEX_FORMAT = 1
+
+
+def _entry_points():
+    """Yield ``(module path, distribution name, distribution version)`` for
+    each entry point of the ``apispec.plugins`` group.
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        import pkg_resources
+        for entry_point in pkg_resources.iter_entry_points(ENTRY_POINT_GROUP):
+            yield entry_point.module_name, entry_point.dist.project_name, entry_point.dist.version
+        return
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        entry_points = entry_points.select(group=ENTRY_POINT_GROUP)
+    else:
+        entry_points = entry_points.get(ENTRY_POINT_GROUP, ())
+    for entry_point in entry_points:
+        dist = getattr(entry_point, 'dist', None)
+        yield (
+            entry_point.value.split(':')[0].strip(),
+            dist.metadata['Name'] if dist else None,
+            dist.version if dist else None,
+        )
+
+
+def plugin_triggers(path):
+    """Import a plugin module and return its ``TRIGGERS``, or `None` if it
+    declares none.
+
+    :param str path: Import path to the plugin.
+    :raise: PluginError if the plugin can't be imported.
+    """
+    try:
+        mod = __import__(path, globals=None, locals=None, fromlist=('setup', ))
+    except ImportError as err:
+        raise PluginError('Could not import plugin "{0}"\n\n{1}'.format(path, err))
+    triggers = getattr(mod, 'TRIGGERS', None)
+    if triggers is None:
+        return None
+    return dict((kind, sorted(kwargs)) for kind, kwargs in iteritems(triggers))
+
+
+def index_path():
+    """Return the path of the index file."""
+    return os.path.expanduser(os.environ.get('APISPEC_PLUGIN_INDEX', DEFAULT_INDEX))
+
+
+def _read_index(path):
+    try:
+        with open(path) as fp:
+            index = json.load(fp)
+    except (IOError, OSError, ValueError):
+        return {}
+    if not isinstance(index, dict) or index.get('format') != INDEX_FORMAT:
+        return {}
+    return index.get('plugins', {})
+
+
+def _write_index(path, plugins):
+    """Write the index atomically. Errors are ignored, since the index is
+    only a cache.
+    """
+    directory = os.path.dirname(path)
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w') as fp:
+            json.dump({'format': INDEX_FORMAT, 'plugins': plugins}, fp, sort_keys=True)
+        getattr(os, 'replace', os.rename)(tmp_name, path)
+    except (IOError, OSError):
+        pass
+
+
+def discover(index=None):
+    """Return the plugins declared by installed distributions.
+
+    Plugin modules are imported to read their ``TRIGGERS`` unless the index
+    holds them for the same distribution version.
+
+    :param str index: Path of the index file. Defaults to `index_path`.
+    :return: A `dict` mapping each plugin's import path to its triggers, or
+        to `None` if the plugin declares none and must be set up eagerly.
+    """
+    index = index_path() if index is None else index
+    cached = _read_index(index)
+    plugins = {}
+    entries = {}
+    for path, dist, version in _entry_points():
+        entry = cached.get(path)
+        if entry is None or version is None or \
+                (entry.get('dist'), entry.get('version')) != (dist, version):
+            entry = {'dist': dist, 'version': version, 'triggers': plugin_triggers(path)}
+        entries[path] = entry
+        plugins[path] = entry['triggers']
+    if entries != cached:
+        _write_index(index, entries)
+    return plugins
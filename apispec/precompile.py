@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Parse view docstrings at build time, so that specs are generated without
+parsing any docstring at startup.
+
+The ``apispec-precompile`` command imports every module of the given
+packages and writes the operations found in the docstrings of their
+functions, classes and methods to an artifact: ::
+
+    $ apispec-precompile myapp -o myapp/operations.bin
+
+A spec created with ``precompiled`` set to that artifact passes the
+stored operations to the plugin helpers of `apispec.ext.flask` and
+`apispec.ext.marshmallow` instead of parsing the view docstrings: ::
+
+    spec = APISpec('Swagger Petstore', '1.0.0', plugins=['apispec.ext.flask'],
+                   precompiled='myapp/operations.bin')
+
+Entries are keyed by the qualified name of the documented object and checked
+against a hash of its docstring. Views whose docstring changed since the
+artifact was built, or that are missing from it, are parsed as usual.
+
+The artifact is written with `marshal`, which is fast to load but specific
+to a Python version: it must be built by the interpreter that loads it. It
+must also be built with the ``docstring_parser`` of the spec, see
+``--parser``; the spec raises an error otherwise.
+"""
+import sys
+import inspect
+import marshal
+import hashlib
+import pkgutil
+import argparse
+
+from apispec import utils
+from apispec.exceptions import APISpecError
+
+ARTIFACT_FORMAT = 1
+
+
+def qualified_name(obj):
+    """Return the key of a function or class in an artifact, e.g.
+    ``'myapp.views:PetView.get'``.
+    """
+    return '{0}:{1}'.format(
+        getattr(obj, '__module__', None),
+        getattr(obj, '__qualname__', getattr(obj, '__name__', None)),
+    )
+
+
+def docstring_hash(docstring):
+    """Return the hash of a docstring stored along with its operations."""
+    return hashlib.sha1(docstring.encode('utf-8')).hexdigest()
+
+
+def _documented_objects(module):
+    """Yield the functions, classes and methods defined in a module."""
+    for obj in list(vars(module).values()):
+        if getattr(obj, '__module__', None) != module.__name__:
+            continue
+        if inspect.isfunction(obj):
+            yield obj
+        elif inspect.isclass(obj):
+            yield obj
+            for member in list(vars(obj).values()):
+                member = getattr(member, '__func__', member)  # staticmethod, classmethod
+                if inspect.isfunction(member):
+                    yield member
+
+
+def _modules(package):
+    package = __import__(package, fromlist=('__name__', ))
+    yield package
+    for _, name, _ in pkgutil.walk_packages(
+            getattr(package, '__path__', []), package.__name__ + '.'):
+        yield __import__(name, fromlist=('__name__', ))
+
+
+def compile_packages(packages, parser=None):
+    """Import every module of the given packages and parse the docstrings
+    of their functions, classes and methods with
+    `load_operations_from_docstring <apispec.utils.load_operations_from_docstring>`.
+
+    Docstrings without a ``---`` line are skipped, as are operations that
+    can't be marshalled, e.g. YAML timestamps.
+
+    :param list packages: Import paths of the packages or modules.
+    :param str parser: Name of the docstring parser, see
+        `get_docstring_parser <apispec.utils.get_docstring_parser>`.
+    :return: A `dict` mapping qualified names to ``(docstring hash,
+        marshalled operations)`` tuples.
+    """
+    entries = {}
+    for package in packages:
+        for module in _modules(package):
+            for obj in _documented_objects(module):
+                docstring = getattr(obj, '__doc__', None)
+                if not docstring or '---' not in docstring:
+                    continue
+                operations = utils.load_operations_from_docstring(docstring, parser=parser)
+                try:
+                    data = marshal.dumps(operations)
+                except ValueError:
+                    continue
+                entries[qualified_name(obj)] = (docstring_hash(docstring), data)
+    return entries
+
+
+def write_artifact(path, entries, parser=None):
+    """Write entries returned by `compile_packages` to a file."""
+    header = {
+        'format': ARTIFACT_FORMAT,
+        'python': tuple(sys.version_info[:2]),
+        'parser': parser or utils.DEFAULT_DOCSTRING_PARSER,
+    }
+    with open(path, 'wb') as fp:
+        marshal.dump((header, entries), fp)
+
+
+class PrecompiledOperations(object):
+    """Operations read from an artifact written by ``apispec-precompile``.
+
+    :param str path: Path of the artifact.
+    :raise: APISpecError if the artifact can't be read, or was written by
+        another version of Python.
+    :ivar str parser: Name of the docstring parser used to build the artifact.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, 'rb') as fp:
+                header, entries = marshal.load(fp)
+        except (IOError, OSError, EOFError, ValueError, TypeError) as error:
+            raise APISpecError('Could not read precompiled operations from "{0}": {1}'.format(
+                path, error))
+        python = tuple(sys.version_info[:2])
+        if header.get('format') != ARTIFACT_FORMAT or tuple(header.get('python', ())) != python:
+            raise APISpecError(
+                'Precompiled operations in "{0}" were written for another version of '
+                'Python or apispec, rebuild them with apispec-precompile'.format(path)
+            )
+        self.parser = header.get('parser')
+        self._entries = entries
+        # Lookup by docstring, for views that are wrappers of the documented
+        # objects, e.g. the result of a Flask MethodView's as_view
+        self._by_hash = dict((entry[0], entry[1]) for entry in entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, view):
+        """Return a copy of the operations stored for a view.
+
+        :param view: Function or class whose docstring defines operations.
+        :raise: KeyError if the view's docstring is not in the artifact.
+        """
+        docstring = getattr(view, '__doc__', None)
+        if not docstring:
+            raise KeyError(view)
+        digest = docstring_hash(docstring)
+        entry = self._entries.get(qualified_name(view))
+        if entry is not None and entry[0] == digest:
+            return marshal.loads(entry[1])
+        return marshal.loads(self._by_hash[digest])
+
+
+def main(argv=None):
+    """Entry point of the ``apispec-precompile`` command."""
+    argparser = argparse.ArgumentParser(
+        prog='apispec-precompile',
+        description='Parse the operations in the docstrings of a package ahead of time.',
+    )
+    argparser.add_argument('packages', nargs='+', metavar='package',
+                           help='import path of a package or module to scan')
+    argparser.add_argument('-o', '--output', default='apispec-operations.bin',
+                           help='path of the artifact (default: %(default)s)')
+    argparser.add_argument('--parser', choices=sorted(utils.DOCSTRING_PARSERS),
+                           default=utils.DEFAULT_DOCSTRING_PARSER,
+                           help='docstring parser, as passed to APISpec (default: %(default)s)')
+    args = argparser.parse_args(argv)
+    if '' not in sys.path:
+        sys.path.insert(0, '')
+    entries = compile_packages(args.packages, parser=args.parser)
+    write_artifact(args.output, entries, parser=args.parser)
+    print('Wrote {0} docstrings to {1}'.format(len(entries), args.output))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
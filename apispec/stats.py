@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Timing of plugin helpers, for finding out where spec generation spends its time.
+
+Example: ::
+
+    from apispec import APISpec
+    from apispec.stats import HelperStats
+
+    stats = HelperStats()
+    spec = APISpec('Swagger Petstore', '1.0.0', plugins=['apispec.ext.flask'], stats=stats)
+    ...
+    print(stats.report())
+
+``stats`` may also be any callable taking the same arguments as
+`HelperStats.__call__`.
+
+`deep_sizeof` measures the memory retained by an object graph, and is used
+by `APISpec.memory_report <apispec.APISpec.memory_report>`.
+"""
+import sys
+import types
+import functools
+import threading
+
+from apispec.compat import itervalues, iteritems, basestring
+
+# Kinds of work that are timed
+PATH_HELPER = 'path_helper'
+DEFINITION_HELPER = 'definition_helper'
+RESPONSE_HELPER = 'response_helper'
+# Import and setup of a plugin by `APISpec.setup_plugin`
+PLUGIN = 'plugin'
+
+
+# Shared code rather than data, never counted by `deep_sizeof`
+CODE_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, types.CodeType,
+)
+
+
+def deep_sizeof(obj, seen=None):
+    """Return the size in bytes of an object and of everything it references,
+    as reported by `sys.getsizeof`. Classes, modules and functions are not
+    counted, nor is anything reachable only through them.
+
+    :param obj: The object to measure.
+    :param set seen: Ids of objects already counted, which are skipped. Pass
+        the same set to several calls to count shared objects once.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, CODE_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            for key, value in iteritems(obj):
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, functools.partial):
+            stack.append(obj.args)
+            stack.append(obj.keywords)
+        elif not isinstance(obj, basestring):
+            if hasattr(obj, '__dict__'):
+                stack.append(vars(obj))
+            for slot in getattr(type(obj), '__slots__', ()):
+                if hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+    return size
+
+
+def target_name(target):
+    """Return a readable name for a helper or plugin path."""
+    if isinstance(target, basestring):
+        return target
+    func = getattr(target, 'func', target)  # functools.partial
+    return '{0}.{1}'.format(
+        getattr(func, '__module__', None),
+        getattr(func, '__qualname__', getattr(func, '__name__', repr(func))),
+    )
+
+
+class HelperTiming(object):
+    """Accumulated measurements of one helper or plugin.
+
+    :ivar str kind: Kind of work, e.g. ``'path_helper'``.
+    :ivar str name: Name of the helper or import path of the plugin.
+    :ivar int calls: Number of calls.
+    :ivar float time: Total wall time in seconds, including the deferred work
+        returned by the helper, e.g. the callables returned by definition
+        helpers, computed later for ``lazy_definitions``.
+    :ivar int errors: Number of exceptions raised by the calls and deferred work.
+    :ivar str last_error: ``repr`` of the last exception raised, or `None`.
+    """
+    __slots__ = ('kind', 'name', 'calls', 'time', 'errors', 'last_error')
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.calls = 0
+        self.time = 0.0
+        self.errors = 0
+        self.last_error = None
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def __repr__(self):
+        return '<HelperTiming({0}, {1}, calls={2}, time={3:.6f}, errors={4})>'.format(
+            self.kind, self.name, self.calls, self.time, self.errors)
+
+
+class HelperStats(object):
+    """Collects the wall time, call count and exceptions of each helper and
+    plugin setup of the specs it is passed to as ``stats``. Thread-safe.
+
+    :ivar dict timings: `HelperTiming` objects keyed by ``(kind, name)``.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'timings': self.timings}
+
+    def __setstate__(self, state):
+        self.timings = state['timings']
+        self._lock = threading.Lock()
+
+    def __call__(self, kind, target, elapsed, error=None, deferred=False):
+        """Record a call.
+
+        :param str kind: Kind of work, e.g. ``'path_helper'``.
+        :param target: The helper, or the import path of the plugin.
+        :param float elapsed: Wall time of the call in seconds.
+        :param Exception error: Exception raised by the call, if any.
+        :param bool deferred: Whether the call is deferred work returned by
+            an earlier call of the helper, which is not counted as a call.
+            Only passed if `True`.
+        """
+        key = (kind, target_name(target))
+        with self._lock:
+            timing = self.timings.get(key)
+            if timing is None:
+                timing = self.timings[key] = HelperTiming(*key)
+            if not deferred:
+                timing.calls += 1
+            timing.time += elapsed
+            if error is not None:
+                timing.errors += 1
+                timing.last_error = repr(error)
+
+    def total_time(self, kind=None):
+        """Return the total wall time recorded, for one kind of work or all of them."""
+        return sum(
+            timing.time for timing in itervalues(self.timings)
+            if kind is None or timing.kind == kind
+        )
+
+    def clear(self):
+        with self._lock:
+            self.timings.clear()
+
+    def report(self):
+        """Return a text table of the timings, slowest first."""
+        lines = ['{0:>10} {1:>8} {2:>6}  {3:<17} {4}'.format(
+            'time (s)', 'calls', 'errors', 'kind', 'name')]
+        for timing in sorted(itervalues(self.timings), key=lambda timing: -timing.time):
+            lines.append('{0:>10.4f} {1:>8} {2:>6}  {3:<17} {4}'.format(
+                timing.time, timing.calls, timing.errors, timing.kind, timing.name))
+        return '\n'.join(lines)
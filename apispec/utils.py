@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
+# Modules other than re are imported where they are used, to keep
+# `import apispec` fast
 import re
-import json
-import tempfile
-import subprocess
+import copy
+import threading
+from collections import OrderedDict
 
-import yaml
-
-from apispec.compat import iteritems
+from apispec.compat import iteritems, text_type, binary_type
 from apispec import exceptions
 
 # from django.contrib.admindocs.utils
@@ -42,25 +42,268 @@ def dedent(content):
 
     return content.strip()
 
-def load_yaml_from_docstring(docstring):
-    """Loads YAML from docstring."""
-    split_lines = trim_docstring(docstring).split('\n')
+def _copy_data(obj):
+    """Deep copy parsed YAML, with fast paths for mappings, lists and scalars."""
+    if isinstance(obj, dict):
+        return dict((key, _copy_data(value)) for key, value in iteritems(obj))
+    if isinstance(obj, list):
+        return [_copy_data(item) for item in obj]
+    if obj is None or isinstance(obj, (bool, int, float, text_type, binary_type)):
+        return obj
+    return copy.deepcopy(obj)
 
-    # Cut YAML from rest of docstring
-    for index, line in enumerate(split_lines):
-        line = line.strip()
-        if line.startswith('---'):
-            cut_from = index
-            break
-    else:
-        return None
 
-    yaml_string = "\n".join(split_lines[cut_from:])
-    yaml_string = dedent(yaml_string)
+class DocstringCache(object):
+    """Least recently used cache of parsed docstrings, keyed by their content.
+
+    `load_yaml_from_docstring` stores its results in the module-level
+    ``docstring_cache``, which is shared by all plugin helpers: ::
+
+        from apispec.utils import docstring_cache
+
+        docstring_cache.maxsize = 20000
+        print(docstring_cache.hits, docstring_cache.misses)
+
+    Rebuilding a spec reads every docstring in the same order, so a cache
+    smaller than the number of documented views evicts each entry before it
+    is read again, and rebuilds never hit it. ``maxsize`` should be at least
+    that number.
+
+    Values are copied on the way in and out, since helpers modify the
+    operations they are given.
+
+    :param int maxsize: Maximum number of docstrings kept. ``0`` disables
+        the cache.
+    :ivar int hits: Number of lookups that found a value.
+    :ivar int misses: Number of lookups that did not.
+    """
+
+    def __init__(self, maxsize=8192):
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key, parse):
+        """Return a copy of the value cached for ``key``. On a miss, compute it
+        with ``parse(key)`` and cache it.
+
+        :param key: Docstring, or any hashable key.
+        :param callable parse: Function computing the value from the key.
+        """
+        with self._lock:
+            try:
+                value = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries[key] = value
+                return _copy_data(value)
+        value = parse(key)
+        if self._maxsize > 0:
+            with self._lock:
+                self._entries[key] = _copy_data(value)
+                self._evict()
+        return value
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+docstring_cache = DocstringCache()
+
+
+def parse_yaml(text):
+    """Docstring parser for YAML. Uses libyaml's ``CSafeLoader`` if available,
+    otherwise the pure-Python ``SafeLoader``; neither constructs arbitrary
+    Python objects.
+    """
+    import yaml
+    try:
+        return yaml.load(text, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    except yaml.YAMLError as error:
+        mark = getattr(error, 'problem_mark', None)
+        exc = ValueError(str(error))
+        exc.lineno = mark.line + 1 if mark is not None else None
+        raise exc
+
+RE_JSON_ERROR_LINE = re.compile(r'\bline (\d+)')
+
+def parse_json(text):
+    """Docstring parser for JSON."""
+    import json
     try:
-        return yaml.load(yaml_string)
-    except yaml.YAMLError:
+        return json.loads(text)
+    except ValueError as error:
+        # Only json.JSONDecodeError (Python 3.5+) has the line as attribute
+        if getattr(error, 'lineno', None) is None:
+            match = RE_JSON_ERROR_LINE.search(str(error))
+            error.lineno = int(match.group(1)) if match else None
+        raise
+
+def parse_auto(text):
+    """Default docstring parser. Parses the text as JSON if it looks like a
+    JSON object or array and is valid JSON, otherwise as YAML.
+    """
+    if text.lstrip()[:1] in ('{', '['):
+        try:
+            return parse_json(text)
+        except ValueError:
+            pass
+    return parse_yaml(text)
+
+# Docstring parsers by name. A parser receives the text following the
+# ``---`` marker of a docstring and returns the parsed data. It raises
+# `ValueError` if the text is invalid, with the line of the error in the
+# text as ``lineno`` attribute if known, like `json.JSONDecodeError`.
+DOCSTRING_PARSERS = {
+    'auto': parse_auto,
+    'yaml': parse_yaml,
+    'json': parse_json,
+}
+DEFAULT_DOCSTRING_PARSER = 'auto'
+
+def register_docstring_parser(name, parser):
+    """Register a docstring parser, for use as the ``docstring_parser`` of
+    an `APISpec <apispec.APISpec>` or the ``parser`` of
+    `load_yaml_from_docstring`.
+
+    :param str name: Name of the parser.
+    :param callable parser: Function receiving the text following the ``---``
+        marker of a docstring and returning the parsed data. It must raise
+        `ValueError` if the text is invalid, with the 1-based line number of
+        the error as ``lineno`` attribute if known.
+    """
+    DOCSTRING_PARSERS[name] = parser
+
+def get_docstring_parser(parser=None):
+    """Return a docstring parser function.
+
+    :param parser: Name of a registered parser, a parser function, or `None`
+        for the default parser.
+    :raise: APISpecError if no parser is registered under the given name.
+    """
+    if parser is None:
+        parser = DEFAULT_DOCSTRING_PARSER
+    if callable(parser):
+        return parser
+    try:
+        return DOCSTRING_PARSERS[parser]
+    except KeyError:
+        raise exceptions.APISpecError('Unknown docstring parser: {0}'.format(parser))
+
+def load_yaml_from_docstring(docstring, parser=None):
+    """Loads YAML from docstring. Results are cached in ``docstring_cache``,
+    see `DocstringCache`.
+
+    Invalid data is ignored with a `DocstringWarning
+    <apispec.exceptions.DocstringWarning>` giving the line of the error,
+    counted from the first line of the docstring. The warning is repeated
+    on each call, including when the result comes from the cache.
+
+    :param str docstring: The docstring. Data is read from the line starting
+        with ``---``. A docstring with several ``---`` lines is invalid.
+    :param parser: Docstring parser to use, see `get_docstring_parser`.
+    """
+    parser = get_docstring_parser(parser)
+    if not docstring or '---' not in docstring:
         return None
+    ret = docstring_cache.get((parser, docstring), _parse_docstring)
+    if isinstance(ret, _InvalidDocstring):
+        import warnings
+        warnings.warn(ret.message, exceptions.DocstringWarning, stacklevel=2)
+        return None
+    return ret
+
+class _InvalidDocstring(object):
+    """Cached result of a docstring whose data is invalid.
+
+    :ivar str message: Message of the warning issued when it is loaded.
+    """
+    __slots__ = ('message', )
+
+    def __init__(self, message):
+        self.message = message
+
+    def __deepcopy__(self, memo):
+        return self
+
+def _find_front_matter(docstring):
+    """Return the offset of the first line of a docstring starting with ``---``,
+    ignoring indentation, or `None`.
+    """
+    position = docstring.find('---')
+    while position != -1:
+        line_start = max(docstring.rfind('\n', 0, position), docstring.rfind('\r', 0, position))
+        line_start += 1
+        if line_start == position or docstring[line_start:position].isspace():
+            return line_start
+        position = docstring.find('---', position + 3)
+    return None
+
+# A YAML document marker, i.e. ``---`` at the start of a line followed by
+# a space or the end of the line
+RE_DOCUMENT_MARKER = re.compile(r'---(\s|$)')
+
+def _parse_docstring(key):
+    """Parse the data of a docstring. Equivalent to cutting the output of
+    `trim_docstring` at the ``---`` line and passing it to `dedent`, but only
+    the lines from the ``---`` marker on are processed.
+
+    :return: The parsed data, `None`, or an `_InvalidDocstring`.
+    """
+    parser, docstring = key
+    line_start = _find_front_matter(docstring)
+    if line_start is None:
+        return None
+    lines = docstring[line_start:].expandtabs().splitlines()
+    indents = [len(line) - len(line.lstrip(' ')) for line in lines[1:] if line.strip()]
+    indent = min(indents) if indents else 0
+    lines[0] = lines[0].strip()
+    for index in range(1, len(lines)):
+        lines[index] = lines[index][indent:].rstrip()
+    text = '\n'.join(lines).rstrip()
+    try:
+        # Data following several markers is several YAML documents, which
+        # are not parsed
+        for index in range(1, len(lines)):
+            if RE_DOCUMENT_MARKER.match(lines[index]):
+                error = ValueError('found another document marker')
+                error.lineno = index + 1
+                raise error
+        return parser(text[3:])
+    except ValueError as error:
+        first_line = len(docstring[:line_start].splitlines()) + 1
+        lineno = getattr(error, 'lineno', None)
+        return _InvalidDocstring(
+            'Ignoring invalid data in docstring {0!r} at line {1}: {2}'.format(
+                docstring.strip().split('\n', 1)[0],
+                first_line if lineno is None else first_line + lineno - 1,
+                error,
+            )
+        )
 
 PATH_KEYS = set([
     'get',
@@ -72,23 +315,79 @@ PATH_KEYS = set([
     'patch',
 ])
 
-def load_operations_from_docstring(docstring):
+def load_operations_from_docstring(docstring, parser=None):
     """Return a dictionary of Swagger operations parsed from a
     a docstring.
+
+    :param parser: Docstring parser to use, see `get_docstring_parser`.
     """
-    doc_data = load_yaml_from_docstring(docstring)
+    doc_data = load_yaml_from_docstring(docstring, parser=parser)
     if doc_data:
         return {key: val for key, val in iteritems(doc_data)
                         if key in PATH_KEYS}
     else:
         return None
 
+def load_operations_from_view(view, parser=None, precompiled=None):
+    """Return a dictionary of Swagger operations defined in a view's
+    docstring, or `None`.
+
+    :param view: Function or class whose docstring defines operations.
+    :param parser: Docstring parser to use, see `get_docstring_parser`.
+    :param precompiled: `PrecompiledOperations <apispec.precompile.PrecompiledOperations>`
+        consulted before parsing the docstring.
+    """
+    if precompiled is not None:
+        try:
+            return precompiled.get(view)
+        except KeyError:
+            pass
+    return load_operations_from_docstring(getattr(view, '__doc__', None), parser=parser)
+
+def load_operations_from_views(views, processes=None, parser=None):
+    """Parse the Swagger operations from the docstrings of many views using
+    a pool of worker processes.
+
+    The results can be passed as ``operations`` to `APISpec.add_path
+    <apispec.APISpec.add_path>`, in which case the path helpers don't parse
+    the docstrings again. ::
+
+        operations = load_operations_from_views(views)
+        spec.add_paths(
+            {'view': view, 'operations': ops} for view, ops in zip(views, operations)
+        )
+
+    :param list views: View functions.
+    :param int processes: Number of worker processes. Defaults to the number
+        of CPUs. If ``1``, docstrings are parsed in the current process.
+    :param parser: Docstring parser to use, see `get_docstring_parser`. It
+        must be picklable, e.g. the name of a registered parser.
+    :return: A list with the operations of each view, in the same order as
+        ``views``. Views without operations map to `None`.
+    """
+    docstrings = [view.__doc__ for view in views]
+    if processes == 1 or len(docstrings) < 2:
+        return [load_operations_from_docstring(docstring, parser) for docstring in docstrings]
+    import functools
+    import multiprocessing
+    pool = multiprocessing.Pool(processes)
+    try:
+        return pool.map(
+            functools.partial(load_operations_from_docstring, parser=parser), docstrings
+        )
+    finally:
+        pool.close()
+        pool.join()
+
 def validate_swagger(spec):
     """Validate the output of an :class:`APISpec` object.
     Note: Requires installing the node package `swagger-tools`.
 
     :raise: SwaggerError if validation fails.
     """
+    import json
+    import tempfile
+    import subprocess
     with tempfile.NamedTemporaryFile(mode='w') as fp:
         json.dump(spec.to_dict(), fp)
         fp.seek(0)
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from apispec import APISpec
+
+from conftest import make_operations
+
+PROPERTIES = {
+    'id': {'type': 'integer', 'format': 'int64'},
+    'name': {'type': 'string'},
+    'tags': {'type': 'array', 'items': {'type': 'string'}},
+}
+
+
+def make_spec(**kwargs):
+    return APISpec(title='Benchmark', version='1.0.0', **kwargs)
+
+
+def populate(spec, size):
+    for index in range(size):
+        spec.definition('Pet{0}'.format(index), properties=PROPERTIES)
+        spec.add_path('/pets/{0}/{{petId}}'.format(index), operations=make_operations(index))
+    return spec
+
+
+def bench_add_path(run, size):
+    operations = [make_operations(index) for index in range(size)]
+
+    def add_paths(spec):
+        for index, ops in enumerate(operations):
+            spec.add_path('/pets/{0}/{{petId}}'.format(index), operations=ops)
+
+    run(add_paths, setup=lambda: ((make_spec(), ), {}))
+
+
+def bench_add_path_with_plugins(run, size):
+    operations = [make_operations(index) for index in range(size)]
+
+    def add_paths(spec):
+        for index, ops in enumerate(operations):
+            spec.add_path('/pets/{0}/{{petId}}'.format(index), operations=ops)
+
+    def setup():
+        return (make_spec(plugins=['apispec.ext.marshmallow', 'apispec.ext.flask']), ), {}
+
+    run(add_paths, setup=setup)
+
+
+def bench_definition(run, size):
+    def add_definitions(spec):
+        for index in range(size):
+            spec.definition('Pet{0}'.format(index), properties=PROPERTIES)
+
+    run(add_definitions, setup=lambda: ((make_spec(), ), {}))
+
+
+def bench_to_dict(run, size):
+    spec = populate(make_spec(), size)
+    run(spec.to_dict)
+
+
+def bench_to_json(run, size):
+    spec = populate(make_spec(), size)
+
+    def setup():
+        spec.invalidate()
+        return (), {}
+
+    run(spec.to_json, setup=setup)
+
+
+def bench_fingerprint(run, size):
+    spec = populate(make_spec(), size)
+
+    def setup():
+        spec.invalidate()
+        return (), {}
+
+    run(spec.fingerprint, setup=setup)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import pytest
+from flask import Flask
+
+from apispec import APISpec
+from apispec.ext.flask import path_from_view
+
+
+@pytest.fixture(scope='session')
+def app(views):
+    app = Flask(__name__)
+    for index, view in enumerate(views):
+        app.add_url_rule('/pets/{0}/<int:pet_id>'.format(index), view_func=view)
+    return app
+
+
+@pytest.fixture()
+def spec():
+    return APISpec(title='Benchmark', version='1.0.0', plugins=['apispec.ext.flask'])
+
+
+def bench_path_from_view(run, app, views, spec):
+    def paths():
+        for view in views:
+            path_from_view(spec, view, operations=None)
+
+    with app.test_request_context():
+        run(paths)
+
+
+def bench_path_from_view_without_docstring(run, app, views, spec):
+    operations = {'get': {'responses': {}}}
+
+    def paths():
+        for view in views:
+            path_from_view(spec, view, operations=operations)
+
+    with app.test_request_context():
+        run(paths)
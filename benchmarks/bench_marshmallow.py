@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from apispec import APISpec
+from apispec.ext.marshmallow import swagger
+
+
+def bench_schema2jsonschema(run, schemas):
+    def convert():
+        for schema in schemas:
+            swagger.schema2jsonschema(schema)
+
+    run(convert)
+
+
+def bench_schema2jsonschema_nested(run, nested_schemas):
+    def convert():
+        for schema in nested_schemas:
+            swagger.schema2jsonschema(schema)
+
+    run(convert)
+
+
+def bench_definition_from_schema(run, nested_schemas):
+    def add_definitions(spec):
+        for schema in nested_schemas:
+            spec.definition(schema.__name__, schema=schema)
+        spec.to_dict()
+
+    def setup():
+        spec = APISpec(title='Benchmark', version='1.0.0', plugins=['apispec.ext.marshmallow'])
+        return (spec, ), {}
+
+    run(add_definitions, setup=setup)
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Memory retained by specs of increasing size.
+
+The tracemalloc measurements and `APISpec.memory_report` are stored in the
+``extra_info`` of each saved benchmark. The benchmarks fail if a spec retains
+more than `MAX_BYTES_PER_ENTRY` per path and definition.
+"""
+import gc
+import tracemalloc
+
+from bench_core import make_spec, populate
+
+# Budget for a path, its definition, and the caches filled by `to_json`
+# and `fingerprint`
+MAX_BYTES_PER_ENTRY = 8 * 1024
+
+
+def build(size):
+    spec = populate(make_spec(plugins=['apispec.ext.marshmallow']), size)
+    spec.to_json()
+    spec.fingerprint()
+    return spec
+
+
+def trace(size):
+    """Return the spec built for ``size`` with the bytes it retains and the
+    peak allocated while building it.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        spec = build(size)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return spec, current - before, peak - before
+
+
+def bench_memory_retained(run, benchmark, size):
+    spec, retained, peak = trace(size)
+    report = run(spec.memory_report)
+    benchmark.extra_info.update(
+        tracemalloc_retained=retained,
+        tracemalloc_peak=peak,
+        memory_report=report,
+    )
+    assert retained <= MAX_BYTES_PER_ENTRY * size
+    # The docstring cache is shared with the other benchmarks
+    assert report['total'] - report['docstring_cache'] <= MAX_BYTES_PER_ENTRY * size
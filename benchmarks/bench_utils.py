@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from apispec import utils
+
+
+def bench_load_operations_from_docstring(run, views):
+    docstrings = [view.__doc__ for view in views]
+
+    def load():
+        for docstring in docstrings:
+            utils.load_operations_from_docstring(docstring)
+
+    # Every round parses all the docstrings, whatever the size of the cache
+    run(load, setup=utils.docstring_cache.clear)
+
+
+def bench_load_operations_from_cached_docstring(run, views):
+    docstrings = [view.__doc__ for view in views]
+
+    def load():
+        for docstring in docstrings:
+            utils.load_operations_from_docstring(docstring)
+
+    # Sized so that every lookup is a hit
+    maxsize = utils.docstring_cache.maxsize
+    utils.docstring_cache.maxsize = len(docstrings)
+    try:
+        load()
+        run(load)
+    finally:
+        utils.docstring_cache.maxsize = maxsize
+
+
+def bench_load_operations_from_plain_docstring(run, views):
+    docstrings = [
+        (view.__doc__ or '').split('---')[0] + '\n    Longer description.\n' for view in views
+    ]
+
+    def load():
+        for docstring in docstrings:
+            utils.load_operations_from_docstring(docstring)
+
+    run(load)
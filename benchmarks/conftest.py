@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Synthetic APIs of increasing size for the benchmark suite."""
+import pytest
+from marshmallow import Schema, fields
+
+# Number of views and schemas in the generated APIs
+SIZES = (100, 1000, 10000)
+# Depth of the chains of nested schemas
+NESTING_DEPTH = 10
+# Rounds are scaled so that each benchmark processes about this many items
+ITEMS_PER_BENCHMARK = 2000
+
+VIEW_DOC = """Pet view {index}.
+    ---
+    get:
+        description: Get pet {index}
+        parameters:
+            - name: petId
+              in: path
+              required: true
+              type: integer
+        responses:
+            200:
+                description: A pet
+                schema: PetSchema{index}
+            404:
+                description: Not found
+    put:
+        description: Update pet {index}
+        responses:
+            204:
+                description: Updated
+    """
+
+
+def make_view(index):
+    def view(pet_id):
+        return ''
+    view.__name__ = 'pet_view_{0}'.format(index)
+    view.__doc__ = VIEW_DOC.format(index=index)
+    return view
+
+
+def make_schema(index, nested=None):
+    """Return a schema class with a field of each common type, nesting the
+    ``nested`` schema class if given.
+    """
+    attrs = {
+        'id': fields.Int(dump_only=True),
+        'name': fields.Str(required=True, description='Name {0}'.format(index)),
+        'price': fields.Float(),
+        'created': fields.DateTime(),
+        'tags': fields.List(fields.Str()),
+        'email': fields.Email(),
+    }
+    if nested is not None:
+        attrs['child'] = fields.Nested(nested)
+        attrs['children'] = fields.Nested(nested, many=True)
+    return type('PetSchema{0}'.format(index), (Schema, ), attrs)
+
+
+def make_operations(index):
+    return {
+        'get': {
+            'description': 'Get pet {0}'.format(index),
+            'parameters': [{'name': 'petId', 'in': 'path', 'required': True}],
+            'responses': {200: {'schema': {'$ref': '#/definitions/Pet{0}'.format(index)}}},
+        },
+        'put': {'responses': {204: {'description': 'Updated'}}},
+    }
+
+
+@pytest.fixture(scope='session', params=SIZES, ids=lambda size: 'n{0}'.format(size))
+def size(request):
+    return request.param
+
+
+@pytest.fixture(scope='session')
+def views(size):
+    return [make_view(index) for index in range(size)]
+
+
+@pytest.fixture(scope='session')
+def schemas(size):
+    """Flat schema classes."""
+    return [make_schema(index) for index in range(size)]
+
+
+@pytest.fixture(scope='session')
+def nested_schemas(size):
+    """Schema classes forming chains of ``NESTING_DEPTH`` nested schemas."""
+    ret = []
+    for index in range(size):
+        parent = ret[-1] if index % NESTING_DEPTH else None
+        ret.append(make_schema(index, nested=parent))
+    return ret
+
+
+@pytest.fixture()
+def run(benchmark, size):
+    """Benchmark a function, scaling the number of rounds down as the size
+    of the API grows.
+
+    :param callable func: Function to benchmark.
+    :param callable setup: Function called before each round, returning the
+        ``(args, kwargs)`` to pass to ``func``.
+    """
+    def run(func, setup=None):
+        rounds = max(1, ITEMS_PER_BENCHMARK // size)
+        return benchmark.pedantic(func, setup=setup, rounds=rounds)
+    return run
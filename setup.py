@@ -45,6 +45,11 @@ setup(
     package_dir={'apispec': 'apispec'},
     include_package_data=True,
     install_requires=REQUIRES,
+    entry_points={
+        'console_scripts': [
+            'apispec-precompile = apispec.precompile:main',
+        ],
+    },
     license=read("LICENSE"),
     zip_safe=False,
     keywords='apispec swagger spec rest api',
@@ -15,6 +15,16 @@ def test():
     errcode = pytest.main(['tests'])
     sys.exit(errcode)
 
+@task
+def benchmark(compare=False):
+    """Run the benchmark suite. Requires pytest-benchmark."""
+    import pytest
+    args = ['benchmarks']
+    if compare:
+        args.extend(['--benchmark-compare', '--benchmark-compare-fail=mean:10%'])
+    errcode = pytest.main(args)
+    sys.exit(errcode)
+
 @task
 def flake():
     """Run flake8 on codebase."""
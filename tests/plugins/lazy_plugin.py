@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from apispec import Path
+
+TRIGGERS = {'path': ['resource'], 'definition': ['model']}
+
+setup_calls = []
+
+
+def resource_helper(spec, resource, **kwargs):
+    return Path(path='/' + resource)
+
+
+def model_helper(spec, name, model, **kwargs):
+    return {'properties': dict((field, {'type': 'string'}) for field in model)}
+
+
+def setup(spec):
+    setup_calls.append(spec)
+    spec.register_path_helper(resource_helper)
+    spec.register_definition_helper(model_helper)
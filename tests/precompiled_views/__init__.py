@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""Views scanned by the tests of apispec.precompile."""
+
+def index():
+    """Index.
+    ---
+    get:
+        responses:
+            200:
+                description: Index
+    """
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+
+def list_pets():
+    """List pets.
+    ---
+    get:
+        responses:
+            200:
+                description: Pets
+    """
+
+def undocumented():
+    """Not a view."""
+
+def dated():
+    """YAML timestamps can't be marshalled.
+    ---
+    get:
+        x-since: 2015-12-13
+    """
+
+class PetView(object):
+    """A pet.
+    ---
+    get:
+        responses:
+            200:
+                description: A pet
+    """
+
+    def put(self):
+        """Update a pet.
+        ---
+        put:
+            responses:
+                204:
+                    description: Updated
+        """
+
+# Imported objects are documented where they are defined
+date = datetime.date
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from apispec import APISpec, Path
+from apispec.exceptions import APISpecError
+from apispec.stats import HelperStats, target_name
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+@pytest.fixture()
+def spec():
+    return APISpec(title='Swagger Petstore', version='1.0.0')
+
+
+class TestAsyncPathHelpers:
+
+    def test_add_path_async(self, spec):
+        async def path_helper(spec, resource, **kwargs):
+            await asyncio.sleep(0)
+            return Path(path='/' + resource, operations={'get': {'responses': {200: {}}}})
+
+        async def response_helper(spec, **kwargs):
+            await asyncio.sleep(0)
+            return {'description': 'ok'}
+
+        spec.register_path_helper(path_helper)
+        spec.register_response_helper(response_helper, 'GET', 200)
+        run(spec.add_path_async(resource='pets'))
+        assert spec._paths['/pets']['get']['responses'][200] == {'description': 'ok'}
+
+    def test_sync_helpers_are_supported(self, spec):
+        def path_helper(spec, resource, **kwargs):
+            return Path(path='/' + resource)
+
+        spec.register_path_helper(path_helper)
+        run(spec.add_path_async(resource='pets', operations={'get': {}}))
+        assert spec._paths['/pets'] == {'get': {}}
+
+    def test_add_path_rejects_coroutine_helpers(self, spec):
+        async def path_helper(spec, resource, **kwargs):
+            return Path(path='/' + resource)
+
+        spec.register_path_helper(path_helper)
+        with pytest.raises(APISpecError):
+            spec.add_path(resource='pets')
+        spec.add_path('/stores')
+        assert '/stores' in spec._paths
+
+    def test_add_paths_async_runs_helpers_concurrently(self, spec):
+        running = []
+        peak = []
+
+        async def path_helper(spec, resource, delay, **kwargs):
+            running.append(resource)
+            peak.append(len(running))
+            await asyncio.sleep(delay)
+            running.remove(resource)
+            return Path(path='/' + resource)
+
+        spec.register_path_helper(path_helper)
+        run(spec.add_paths_async([
+            {'resource': 'pets', 'delay': 0.02},
+            {'resource': 'stores', 'delay': 0.01},
+            {'resource': 'users', 'delay': 0},
+        ]))
+        assert max(peak) == 3
+        assert list(spec._paths) == ['/pets', '/stores', '/users']
+
+    def test_coroutine_helpers_are_timed(self):
+        stats = HelperStats()
+        spec = APISpec(title='Swagger Petstore', version='1.0.0', stats=stats)
+
+        async def path_helper(spec, resource, **kwargs):
+            await asyncio.sleep(0.01)
+            return Path(path='/' + resource)
+
+        spec.register_path_helper(path_helper)
+        run(spec.add_path_async(resource='pets'))
+        timing = stats.timings[('path_helper', target_name(path_helper))]
+        assert timing.calls == 1
+        assert timing.time >= 0.01
+
+
+class TestAsyncDefinitionHelpers:
+
+    def test_definition_async(self, spec):
+        async def definition_helper(spec, name, fmt, **kwargs):
+            await asyncio.sleep(0)
+            return {'properties': {'age': {'type': 'number', 'format': fmt}}}
+
+        spec.register_definition_helper(definition_helper)
+        run(spec.definition_async('Age', fmt='int32', enum=['age']))
+        assert spec.to_dict()['definitions']['Age'] == {
+            'properties': {'age': {'type': 'number', 'format': 'int32'}},
+            'enum': ['age'],
+        }
+        with pytest.raises(APISpecError):
+            spec.definition('Pet', fmt='int32')
+
+    def test_definitions_async(self, spec):
+        async def definition_helper(spec, name, fmt, **kwargs):
+            await asyncio.sleep(0)
+            return {'properties': {'age': {'type': 'number', 'format': fmt}}}
+
+        spec.register_definition_helper(definition_helper)
+        run(spec.definitions_async([
+            {'name': 'Age', 'fmt': 'int32'},
+            {'name': 'Pet', 'properties': {'name': {'type': 'string'}}},
+        ]))
+        definitions = spec.to_dict()['definitions']
+        assert definitions['Age']['properties']['age']['format'] == 'int32'
+        assert definitions['Pet']['properties'] == {'name': {'type': 'string'}}
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+from marshmallow import Schema, fields
+
+from apispec import APISpec
+from apispec.cache import SpecCache, fingerprint
+from apispec.precompile import main
+from .schemas import PetSchema
+
+
+def make_spec(**options):
+    return APISpec(
+        title='Swagger Petstore',
+        version='1.0.0',
+        plugins=['apispec.ext.marshmallow'],
+        **options
+    )
+
+
+def pet_view():
+    """Get a pet.
+
+    ---
+    get:
+        responses:
+            200:
+                schema: PetSchema
+    """
+
+
+def other_view():
+    """Get another pet."""
+
+
+class TestFingerprint:
+
+    def test_fingerprint_is_stable(self):
+        key = fingerprint(make_spec(), views=[pet_view], schemas=[PetSchema])
+        assert key == fingerprint(make_spec(), views=[pet_view], schemas=[PetSchema])
+
+    def test_fingerprint_changes_with_inputs(self):
+        key = fingerprint(make_spec(), views=[pet_view], schemas=[PetSchema])
+        assert key != fingerprint(make_spec(basePath='/v1'), views=[pet_view],
+                                  schemas=[PetSchema])
+        assert key != fingerprint(make_spec(), views=[pet_view, other_view],
+                                  schemas=[PetSchema])
+        assert key != fingerprint(make_spec(), views=[pet_view], schemas=[PetSchema],
+                                  extra=['v2'])
+
+    def test_fingerprint_covers_deferred_plugins(self):
+        def key(plugins):
+            spec = APISpec(title='Swagger Petstore', version='1.0.0',
+                           plugins=plugins, lazy_plugins=True)
+            assert not spec.plugins
+            return fingerprint(spec)
+        assert key(['apispec.ext.flask']) != key([])
+        assert key(['apispec.ext.flask']) != key(['apispec.ext.marshmallow'])
+        assert key(['apispec.ext.flask']) == key(['apispec.ext.flask'])
+
+    def test_fingerprint_covers_docstring_parser(self):
+        def key(**kwargs):
+            return fingerprint(APISpec(title='Swagger Petstore', version='1.0.0', **kwargs))
+        assert key() == key(docstring_parser='auto')
+        assert key(docstring_parser='yaml') != key()
+        assert key(docstring_parser='yaml') != key(docstring_parser=lambda text: {})
+        assert key(docstring_parser='yaml') == key(docstring_parser='yaml')
+
+    def test_fingerprint_covers_precompiled_parser(self, tmpdir):
+        path = str(tmpdir.join('operations.bin'))
+        assert main(['tests.precompiled_views', '-o', path, '--parser', 'yaml']) == 0
+        key = fingerprint(APISpec(title='Swagger Petstore', version='1.0.0',
+                                  docstring_parser='yaml', precompiled=path))
+        assert key != fingerprint(APISpec(title='Swagger Petstore', version='1.0.0',
+                                          docstring_parser='yaml'))
+
+    def test_fingerprint_changes_with_schema_fields(self):
+        def make_schema(required):
+            class CategorySchema(Schema):
+                id = fields.Int()
+                name = fields.Str(required=required, validate=lambda value: True)
+                pets = fields.Nested(PetSchema, many=True)
+            return CategorySchema
+
+        key = fingerprint(make_spec(), schemas=[make_schema(False)])
+        assert key == fingerprint(make_spec(), schemas=[make_schema(False)])
+        assert key != fingerprint(make_spec(), schemas=[make_schema(True)])
+
+    def test_fingerprint_ignores_field_order(self):
+        def make_schema(names):
+            declared = dict((name, fields.Nested(PetSchema)) for name in names)
+            return type('OwnerSchema', (object, ), {'_declared_fields': declared})
+
+        key = fingerprint(make_spec(), schemas=[make_schema(['pet', 'favorite'])])
+        assert key == fingerprint(make_spec(), schemas=[make_schema(['favorite', 'pet'])])
+
+
+class TestSpecCache:
+
+    @pytest.fixture()
+    def cache(self, tmpdir):
+        return SpecCache(os.path.join(str(tmpdir), 'specs'))
+
+    def test_get_missing(self, cache):
+        assert cache.get('missing') is None
+
+    def test_set_and_get(self, cache):
+        spec = make_spec()
+        spec.definition('Pet', schema=PetSchema)
+        spec.add_path('/pets', operations={'get': {'responses': {200: {'description': 'ok'}}}})
+        cache.set('key', spec)
+        cached = cache.get('key')
+        assert cached['definitions']['Pet']['properties']['name'] == {'type': 'string'}
+        assert cached['paths']['/pets']['get']['responses']['200'] == {'description': 'ok'}
+        assert os.listdir(cache.directory) == ['key.json']
+
+    def test_get_or_build(self, cache):
+        calls = []
+
+        def build():
+            calls.append(1)
+            spec = make_spec()
+            spec.definition('Pet', schema=PetSchema)
+            return spec.to_dict()
+
+        first = cache.get_or_build('key', build)
+        assert cache.get_or_build('key', build) == first
+        assert 'Pet' in first['definitions']
+        assert len(calls) == 1
+
+    def test_corrupt_file_is_a_miss(self, cache):
+        cache.set('key', {'swagger': '2.0'})
+        with open(os.path.join(cache.directory, 'key.json'), 'w') as fp:
+            fp.write('{')
+        assert cache.get('key') is None
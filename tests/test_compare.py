@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+import json
+
+import mock
+import pytest
+
+from apispec import APISpec, diff
+from apispec.compare import escape_pointer
+
+
+def make_spec():
+    spec = APISpec(title='Swagger Petstore', version='1.0.0')
+    spec.definition('Pet', properties={
+        'id': {'type': 'integer'},
+        'name': {'type': 'string'},
+    })
+    spec.add_parameter('petId', 'path', type='integer')
+    spec.add_path('/pets', operations={
+        'get': {'responses': {200: {'description': 'ok'}}},
+        'post': {'responses': {201: {'description': 'created'}}},
+    })
+    spec.add_path('/pets/{petId}', operations={
+        'get': {'parameters': ['petId'], 'responses': {200: {'description': 'ok'}}},
+    })
+    return spec
+
+
+def apply_patch(doc, patch):
+    """Minimal RFC 6902 implementation supporting add, remove and replace."""
+    doc = json.loads(json.dumps(doc))
+    for operation in patch:
+        keys = [
+            key.replace('~1', '/').replace('~0', '~')
+            for key in operation['path'].split('/')[1:]
+        ]
+        target = doc
+        for key in keys[:-1]:
+            target = target[key]
+        if operation['op'] == 'remove':
+            del target[keys[-1]]
+        else:
+            target[keys[-1]] = json.loads(json.dumps(operation['value']))
+    return doc
+
+
+class TestDiff:
+
+    def test_no_changes(self):
+        result = diff(make_spec(), make_spec())
+        assert not result
+        assert result.patch == []
+        assert result.breaking == []
+
+    def test_unchanged_entries_are_skipped(self):
+        old, new = make_spec(), make_spec()
+        new.add_path('/stores')
+        with mock.patch('apispec.compare._diff_path') as diff_path:
+            diff(old, new)
+        assert not diff_path.called
+
+    def test_patch_applies(self):
+        old, new = make_spec(), make_spec()
+        new.options['host'] = 'petstore.swagger.io'
+        new.definition('Pet', properties={'name': {'type': 'string'}}, enum=['name'])
+        new.definition('Store', properties={'name': {'type': 'string'}})
+        new._paths['/pets'].pop('post')
+        new.add_path('/pets', operations={'put': {'responses': {}}})
+        new._paths.pop('/pets/{petId}')
+        new.invalidate()
+
+        result = diff(old, new)
+        assert apply_patch(old.to_dict(), result.patch) == json.loads(new.to_json())
+        assert {'op': 'remove', 'path': '/paths/~1pets/post'} in result.patch
+        assert {'op': 'remove', 'path': '/paths/~1pets~1{petId}'} in result.patch
+
+    def test_breaking_changes(self):
+        old, new = make_spec(), make_spec()
+        new.definition('Pet', properties={'name': {'type': 'string'}}, required=['name'])
+        new._definitions['Pet']['required'] = ['name']
+        new._paths['/pets'].pop('post')
+        new._paths['/pets']['get']['parameters'] = [
+            {'in': 'query', 'name': 'limit', 'required': True},
+        ]
+        new._parameters.pop('petId')
+        new.invalidate()
+
+        breaking = diff(old, new).breaking
+        assert 'Removed operation POST /pets' in breaking
+        assert 'Removed property id from definition Pet' in breaking
+        assert 'Added required property name to definition Pet' in breaking
+        assert 'Added required parameter query:limit to GET /pets' in breaking
+        assert 'Removed parameter petId' in breaking
+
+    def test_additions_are_not_breaking(self):
+        old, new = make_spec(), make_spec()
+        new.add_path('/pets', operations={'delete': {'responses': {}}})
+        new.definition('Store', properties={'name': {'type': 'string'}})
+        result = diff(old, new)
+        assert len(result.patch) == 2
+        assert result.breaking == []
+
+    def test_diff_dicts(self):
+        old = json.loads(make_spec().to_json())
+        new = make_spec()
+        new.add_path('/stores')
+        result = diff(old, new)
+        assert result.patch == [{'op': 'add', 'path': '/paths/~1stores', 'value': {}}]
+
+    def test_dict_entries_are_compared_without_hashing(self):
+        old = json.loads(make_spec().to_json())
+        new = json.loads(make_spec().to_json())
+        new['definitions']['Pet']['properties']['tag'] = {'type': 'string'}
+        with mock.patch('apispec.core.canonical_json') as canonical_json, \
+                mock.patch('apispec.compare._diff_path') as diff_path:
+            result = diff(old, new)
+        assert not canonical_json.called
+        assert not diff_path.called
+        assert [op['path'] for op in result.patch] == ['/definitions/Pet']
+
+
+@pytest.mark.parametrize(('key', 'expected'), [
+    ('/pets/{petId}', '~1pets~1{petId}'),
+    ('a~b', 'a~0b'),
+])
+def test_escape_pointer(key, expected):
+    assert escape_pointer(key) == expected
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
+import copy
+import json
+import pickle
+import threading
+
 import pytest
 import mock
+import yaml
 
-from apispec import APISpec, Path
+from apispec import APISpec, Path, merge_specs, utils
 from apispec.exceptions import PluginError, APISpecError
 
 
@@ -12,6 +18,18 @@ description = 'This is a sample Petstore server.  You can find out more '
 'key \"special-key\" to test the authorization filters'
 
 
+def write_file(tmpdir, spec, **kwargs):
+    """Write a spec with ``spec.write`` to a file opened with `open`, which
+    accepts the native strings written on both Python 2 and 3, and return
+    the contents.
+    """
+    path = str(tmpdir.join('spec.out'))
+    with open(path, 'w') as fp:
+        spec.write(fp, **kwargs)
+    with open(path) as fp:
+        return fp.read()
+
+
 @pytest.fixture()
 def spec():
     return APISpec(
@@ -34,6 +52,199 @@ class TestMetadata:
         assert metadata['info']['version'] == '1.0.0'
         assert metadata['info']['description'] == description
 
+    def test_unknown_docstring_parser(self):
+        with pytest.raises(APISpecError):
+            APISpec(title='Swagger Petstore', version='1.0.0', docstring_parser='toml')
+        spec = APISpec(title='Swagger Petstore', version='1.0.0', docstring_parser='json')
+        assert spec.docstring_parser == 'json'
+
+
+class TestToJSON:
+
+    def test_to_json(self, spec):
+        spec.definition('Pet', properties={'name': {'type': 'string'}})
+        assert json.loads(spec.to_json()) == json.loads(json.dumps(spec.to_dict()))
+
+    def test_to_json_is_cached(self, spec):
+        with mock.patch('apispec.core.json.dumps', wraps=json.dumps) as dumps:
+            first = spec.to_json()
+            assert spec.to_json() is first
+            assert dumps.call_count == 1
+            spec.to_json(indent=2)
+            assert dumps.call_count == 2
+
+    def test_to_json_regenerated_after_changes(self, spec):
+        before = spec.to_json()
+        spec.add_parameter('limit', 'query', type='integer')
+        after_param = spec.to_json()
+        assert after_param != before
+        assert 'limit' in json.loads(after_param)['parameters']
+        spec.definition('Pet', properties={'name': {'type': 'string'}})
+        assert 'Pet' in json.loads(spec.to_json())['definitions']
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        assert '/pets' in json.loads(spec.to_json())['paths']
+
+    @pytest.mark.parametrize('thread_safe', [False, True])
+    def test_identical_registration_keeps_cache(self, thread_safe):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0', thread_safe=thread_safe)
+
+        def register():
+            spec.add_parameter('limit', 'query', type='integer')
+            spec.definition('Pet', properties={'name': {'type': 'string'}})
+            spec.add_path('/pets', operations={'get': {'responses': {}}})
+        register()
+        first = spec.to_json()
+        register()
+        assert spec.to_json() is first
+        spec.add_path('/pets', operations={'get': {'responses': {'200': {}}}})
+        assert spec.to_json() is not first
+
+    def test_modified_and_registered_again(self, spec):
+        properties = {'name': {'type': 'string'}}
+        spec.definition('Pet', properties=properties)
+        first = spec.to_json()
+        properties['age'] = {'type': 'integer'}
+        spec.definition('Pet', properties=properties)
+        assert 'age' in json.loads(spec.to_json())['definitions']['Pet']['properties']
+        assert spec.to_json() is not first
+
+    def test_nested_value_modified_and_registered_again(self, spec):
+        responses = {'404': {'description': 'Not found'}}
+        spec.add_path('/pets', operations={'get': {'responses': responses}})
+        first = spec.to_json()
+        etag = spec.fingerprint()
+        responses['404']['description'] = 'Pet not found'
+        spec.add_path('/pets', operations={'get': {'responses': responses}})
+        paths = json.loads(spec.to_json())['paths']
+        assert paths['/pets']['get']['responses']['404']['description'] == 'Pet not found'
+        assert spec.fingerprint() != etag
+
+    def test_invalidate(self, spec):
+        spec.to_json()
+        spec.info['description'] = 'changed'
+        spec.invalidate()
+        assert json.loads(spec.to_json())['info']['description'] == 'changed'
+
+
+class TestFingerprint:
+
+    def test_fingerprint_is_stable(self, spec):
+        spec.definition('Pet', properties={'name': {'type': 'string'}})
+        assert spec.fingerprint() == spec.fingerprint()
+
+    def test_fingerprint_does_not_depend_on_order(self, spec):
+        other = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            info={'description': description},
+            security=[{'apiKey': []}],
+        )
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        spec.add_path('/stores', operations={'get': {'responses': {200: {}, 'default': {}}}})
+        other.add_path('/stores', operations={'get': {'responses': {'default': {}, 200: {}}}})
+        other.add_path('/pets', operations={'get': {'responses': {}}})
+        assert spec.fingerprint() == other.fingerprint()
+
+    def test_fingerprint_changes(self, spec):
+        fingerprints = set([spec.fingerprint()])
+        spec.add_parameter('limit', 'query', type='integer')
+        fingerprints.add(spec.fingerprint())
+        spec.definition('Pet', properties={'name': {'type': 'string'}})
+        fingerprints.add(spec.fingerprint())
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        fingerprints.add(spec.fingerprint())
+        spec.add_path('/pets', operations={'post': {'responses': {}}})
+        fingerprints.add(spec.fingerprint())
+        spec.info['description'] = 'changed'
+        fingerprints.add(spec.fingerprint())
+        assert len(fingerprints) == 6
+
+    def test_fingerprint_only_rehashes_changed_entries(self, spec):
+        for index in range(3):
+            spec.add_path('/pets/{0}'.format(index))
+        spec.fingerprint()
+        spec.add_path('/stores')
+        with mock.patch('apispec.core.entry_hash', return_value=0) as entry_hash:
+            spec.fingerprint()
+        entry_hash.assert_called_once_with('paths', '/stores', spec._paths['/stores'])
+
+    def test_invalidate_rehashes_entries(self, spec):
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        before = spec.fingerprint()
+        spec._paths['/pets']['get']['description'] = 'changed'
+        assert spec.fingerprint() == before
+        spec.invalidate()
+        assert spec.fingerprint() != before
+
+
+class TestWrite:
+
+    @pytest.fixture()
+    def populated_spec(self, spec):
+        spec.definition('Pet', properties={'name': {'type': 'string'}})
+        spec.add_parameter('limit', 'query', type='integer')
+        spec.add_path('/pets', operations={
+            'get': {'produces': ('application/json', ), 'responses': {'200': {'description': 'ok'}}}
+        })
+        spec.add_path('/pets/{petId}', operations={'delete': {'responses': {}}})
+        return spec
+
+    def test_write_json(self, populated_spec, tmpdir):
+        written = write_file(tmpdir, populated_spec)
+        assert json.loads(written) == json.loads(populated_spec.to_json())
+
+    def test_write_yaml(self, populated_spec, tmpdir):
+        written = write_file(tmpdir, populated_spec, format='yaml')
+        assert yaml.safe_load(written) == json.loads(populated_spec.to_json())
+
+    def test_write_empty_sections(self, spec, tmpdir):
+        for fmt in ('json', 'yaml'):
+            assert yaml.safe_load(write_file(tmpdir, spec, format=fmt))['paths'] == {}
+
+    def test_write_invalid_format(self, spec, tmpdir):
+        with pytest.raises(APISpecError):
+            write_file(tmpdir, spec, format='xml')
+
+
+class TestMemoryReport:
+
+    def test_memory_report(self, spec):
+        empty = spec.memory_report()
+        spec.definition('Pet', properties={'name': {'type': 'string'}})
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        spec.to_json()
+        report = spec.memory_report()
+        for section in ('paths', 'definitions', 'caches'):
+            assert report[section] > empty[section]
+        assert report['parameters'] == empty['parameters']
+        assert report['total'] == sum(
+            value for key, value in report.items()
+            if key not in ('total', 'docstring_cache_entries')
+        )
+
+    def test_shared_objects_are_counted_once(self, spec):
+        properties = {'name': {'type': 'string', 'description': 'x' * 10000}}
+        spec.definition('Pet', properties=properties)
+        spec.add_parameter('pet', 'body', schema={'properties': properties})
+        report = spec.memory_report()
+        assert report['definitions'] > 10000
+        assert report['parameters'] < 10000
+
+    def test_docstring_cache_is_counted(self, spec):
+        utils.docstring_cache.clear()
+        empty = spec.memory_report()
+        assert empty['docstring_cache_entries'] == 0
+        utils.load_yaml_from_docstring('Pets.\n---\nget:\n    description: ' + 'x' * 10000)
+        report = spec.memory_report()
+        assert report['docstring_cache_entries'] == 1
+        assert report['docstring_cache'] > empty['docstring_cache'] + 10000
+
+    def test_deferred_plugins_are_counted(self, spec):
+        empty = spec.memory_report()
+        spec.setup_plugin('tests.plugins.lazy_plugin', triggers={'path': ['x' * 10000]})
+        assert not spec.plugins
+        assert spec.memory_report()['plugins'] > empty['plugins'] + 10000
+
 
 class TestDefinitions:
 
@@ -58,6 +269,271 @@ class TestDefinitions:
         defs_json = spec.to_dict()['definitions']
         assert defs_json['Pet']['enum'] == enum
 
+    def test_definitions(self, spec):
+        def definition_helper(spec, name, fmt, **kwargs):
+            return {'properties': {'age': {'type': 'number', 'format': fmt}}}
+        spec.register_definition_helper(definition_helper)
+        spec.definitions([
+            {'name': 'Pet', 'properties': self.properties},
+            {'name': 'Age', 'fmt': 'int32'},
+        ])
+        defs_json = spec.to_dict()['definitions']
+        assert defs_json['Pet']['properties'] == self.properties
+        assert defs_json['Age']['properties']['age']['format'] == 'int32'
+
+
+class TestLazyDefinitions:
+
+    @pytest.fixture()
+    def lazy_spec(self):
+        return APISpec(title='Swagger Petstore', version='1.0.0', lazy_definitions=True)
+
+    @pytest.fixture()
+    def calls(self, lazy_spec):
+        calls = []
+
+        def definition_helper(spec, name, **kwargs):
+            def build():
+                calls.append(name)
+                return {'properties': {'name': {'type': 'string'}}}
+            return build
+
+        lazy_spec.register_definition_helper(definition_helper)
+        return calls
+
+    def test_definitions_are_computed_on_serialization(self, lazy_spec, calls):
+        lazy_spec.definition('Pet', enum=['name'])
+        lazy_spec.definition('Store')
+        assert calls == []
+        assert 'Pet' not in lazy_spec._definitions
+        definitions = lazy_spec.to_dict()['definitions']
+        assert definitions['Pet'] == {
+            'properties': {'name': {'type': 'string'}},
+            'enum': ['name'],
+        }
+        assert sorted(calls) == ['Pet', 'Store']
+        lazy_spec.to_dict()
+        assert len(calls) == 2
+
+    def test_definition_is_computed_on_resolve_ref(self, lazy_spec, calls):
+        lazy_spec.definition('Pet')
+        lazy_spec.definition('Store')
+        pet = lazy_spec.resolve_ref('#/definitions/Pet')
+        assert pet['properties'] == {'name': {'type': 'string'}}
+        assert calls == ['Pet']
+        assert lazy_spec.resolve_ref('#/definitions/Pet') is pet
+        assert calls == ['Pet']
+
+    def test_fingerprint_computes_definitions(self, lazy_spec, calls):
+        lazy_spec.definition('Pet')
+        lazy_spec.fingerprint()
+        assert calls == ['Pet']
+
+    def test_failed_definition_is_retried(self, lazy_spec):
+        attempts = []
+
+        def definition_helper(spec, name, **kwargs):
+            def build():
+                attempts.append(name)
+                if len(attempts) == 1:
+                    raise ValueError('invalid schema')
+                return {'type': 'object'}
+            return build
+
+        lazy_spec.register_definition_helper(definition_helper)
+        lazy_spec.definition('Pet')
+        with pytest.raises(ValueError):
+            lazy_spec.to_dict()
+        assert lazy_spec.to_dict()['definitions'] == {'Pet': {'type': 'object'}}
+        assert attempts == ['Pet', 'Pet']
+
+    def test_eager_definitions_call_deferred_helpers(self, spec):
+        spec.register_definition_helper(lambda spec, name, **kwargs: lambda: {'type': 'object'})
+        spec.definition('Pet')
+        assert spec._definitions['Pet'] == {'type': 'object'}
+
+    def test_resolve_ref(self, spec):
+        spec.add_parameter('limit', 'query')
+        assert spec.resolve_ref('#/parameters/limit') == {'name': 'limit', 'in': 'query'}
+        with pytest.raises(APISpecError):
+            spec.resolve_ref('#/definitions/Missing')
+
+
+class TestPrune:
+
+    @pytest.fixture()
+    def pruned_spec(self, spec):
+        spec.definition('Category', properties={'name': {'type': 'string'}})
+        spec.definition('Pet', properties={
+            'category': {'$ref': '#/definitions/Category'},
+            'tags': {'type': 'array', 'items': {'$ref': '#/definitions/Tag'}},
+        })
+        spec.definition('Tag', properties={'name': {'type': 'string'}})
+        spec.definition('Unused', properties={'pet': {'$ref': '#/definitions/Pet'}})
+        spec.add_parameter('petId', 'path', type='integer')
+        spec.add_parameter('limit', 'query', type='integer')
+        spec.add_path('/pets/{petId}', operations={'get': {
+            'parameters': ['petId'],
+            'responses': {200: {'schema': {'$ref': '#/definitions/Pet'}}},
+        }})
+        return spec
+
+    def test_prune(self, pruned_spec):
+        pruned = pruned_spec.to_dict(prune=True)
+        assert sorted(pruned['definitions']) == ['Category', 'Pet', 'Tag']
+        assert sorted(pruned['parameters']) == ['petId']
+        assert sorted(pruned_spec.to_dict()['definitions']) == [
+            'Category', 'Pet', 'Tag', 'Unused'
+        ]
+
+    def test_prune_follows_changes(self, pruned_spec):
+        pruned_spec.to_dict(prune=True)
+        pruned_spec.add_path('/pets', operations={'get': {
+            'parameters': ['limit'],
+            'responses': {200: {'schema': {'$ref': '#/definitions/Unused'}}},
+        }})
+        pruned = pruned_spec.to_dict(prune=True)
+        assert sorted(pruned['definitions']) == ['Category', 'Pet', 'Tag', 'Unused']
+        assert sorted(pruned['parameters']) == ['limit', 'petId']
+
+    def test_prune_serialization(self, pruned_spec, tmpdir):
+        assert 'Unused' in json.loads(pruned_spec.to_json())['definitions']
+        assert 'Unused' not in json.loads(pruned_spec.to_json(prune=True))['definitions']
+        written = write_file(tmpdir, pruned_spec, prune=True)
+        assert 'Unused' not in json.loads(written)['definitions']
+
+    def test_prune_only_computes_reachable_lazy_definitions(self):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0', lazy_definitions=True)
+        calls = []
+
+        def definition_helper(spec, name, refs=(), **kwargs):
+            def build():
+                calls.append(name)
+                return {'properties': dict(
+                    (ref, {'$ref': '#/definitions/' + ref}) for ref in refs
+                )}
+            return build
+
+        spec.register_definition_helper(definition_helper)
+        spec.definition('Pet', refs=['Category'])
+        spec.definition('Category')
+        spec.definition('Unused')
+        spec.resolve_ref('#/definitions/Pet')
+        spec.add_path('/pets', operations={'get': {
+            'responses': {200: {'schema': {'$ref': '#/definitions/Pet'}}},
+        }})
+        assert sorted(spec.to_dict(prune=True)['definitions']) == ['Category', 'Pet']
+        assert sorted(calls) == ['Category', 'Pet']
+
+
+class TestView:
+
+    @pytest.fixture()
+    def team_spec(self, spec):
+        spec.definition('Pet', properties={'category': {'$ref': '#/definitions/Category'}})
+        spec.definition('Category', properties={'name': {'type': 'string'}})
+        spec.definition('Store', properties={'name': {'type': 'string'}})
+        spec.add_parameter('petId', 'path', type='integer')
+        spec.add_path('/pets/{petId}', operations={
+            'get': {
+                'tags': ['pet'],
+                'parameters': ['petId'],
+                'responses': {200: {'schema': {'$ref': '#/definitions/Pet'}}},
+            },
+            'delete': {'tags': ['admin'], 'parameters': ['petId'], 'responses': {}},
+        })
+        spec.add_path('/stores', operations={'get': {
+            'tags': ['store'],
+            'responses': {200: {'schema': {'$ref': '#/definitions/Store'}}},
+        }})
+        return spec
+
+    def test_view_by_tags(self, team_spec):
+        view = team_spec.view(tags=['pet']).to_dict()
+        assert list(view['paths']) == ['/pets/{petId}']
+        assert list(view['paths']['/pets/{petId}']) == ['get']
+        assert sorted(view['definitions']) == ['Category', 'Pet']
+        assert list(view['parameters']) == ['petId']
+        assert view['info'] == team_spec.info
+
+    def test_view_by_path_prefix(self, team_spec):
+        view = team_spec.view(path_prefix='/stores').to_dict()
+        assert list(view['paths']) == ['/stores']
+        assert list(view['definitions']) == ['Store']
+        assert view['parameters'] == {}
+
+    def test_view_shares_objects(self, team_spec):
+        view = team_spec.view(tags=['pet', 'admin', 'store']).to_dict()
+        assert view['paths']['/pets/{petId}'] is team_spec._paths['/pets/{petId}']
+        assert view['definitions']['Pet'] is team_spec._definitions['Pet']
+        assert team_spec.view(tags=['admin']).to_dict()['definitions'] == {}
+
+    def test_view_reflects_changes(self, team_spec):
+        view = team_spec.view(tags=['store'])
+        team_spec.add_path('/stores/{storeId}', operations={'get': {'tags': ['store']}})
+        assert '/stores/{storeId}' in view.to_dict()['paths']
+
+    def test_view_serialization(self, team_spec, tmpdir):
+        view = team_spec.view(tags=['store'])
+        assert list(json.loads(view.to_json())['paths']) == ['/stores']
+        written = write_file(tmpdir, view, format='yaml')
+        assert list(yaml.safe_load(written)['definitions']) == ['Store']
+
+    def test_single_tag(self, team_spec):
+        assert team_spec.view(tags='store').to_dict() == team_spec.view(tags=['store']).to_dict()
+        assert list(team_spec.view(tags='store').to_dict()['paths']) == ['/stores']
+
+
+class TestPathObject:
+
+    def test_operations_are_stored_once(self):
+        get = {'responses': {}}
+        path = Path(path='/pets', operations={'get': get})
+        assert path.operations is path
+        assert path['get'] is get
+        assert not hasattr(path, '__dict__')
+
+    def test_update(self):
+        path = Path(operations={'get': {}})
+        path.update(Path(path='/pets', operations={'post': {}}))
+        assert path.path == '/pets'
+        assert set(path.operations) == {'get', 'post'}
+        assert path.to_dict() == {'/pets': {'get': {}, 'post': {}}}
+
+    def test_set_operations(self):
+        path = Path(path='/pets', operations={'get': {}})
+        path.operations = {'put': {}}
+        assert path == {'put': {}}
+
+    def test_invalid_method(self):
+        with pytest.raises(APISpecError):
+            Path(path='/pets', operations={'fetch': {}})
+
+    def test_pickle(self):
+        path = Path(path='/pets', operations={'get': {'responses': {}}})
+        loaded = pickle.loads(pickle.dumps(path, protocol=2))
+        assert loaded.path == '/pets'
+        assert loaded == path
+
+    @pytest.mark.parametrize('protocol', range(pickle.HIGHEST_PROTOCOL + 1))
+    def test_pickle_without_path(self, protocol):
+        loaded = pickle.loads(pickle.dumps(Path(), protocol=protocol))
+        assert loaded.path is None
+        assert loaded == {}
+
+    def test_copy_without_path(self):
+        path = Path(operations={'get': {}})
+        for copied in (copy.copy(path), copy.deepcopy(path)):
+            assert copied.path is None
+            assert copied == {'get': {}}
+
+    def test_extra_items(self):
+        path = Path(path='/pets', operations={'get': {}}, method='get')
+        assert path == {'get': {}, 'method': 'get'}
+        stored = Path(path='/pets', operations={'post': {}})
+        stored.update(path)
+        assert stored == {'get': {}, 'post': {}}
+
 
 class TestPath:
     paths = {
@@ -179,6 +655,24 @@ class TestPath:
         assert '/pets' in spec._paths
         assert '/v1/pets' not in spec._paths
 
+    def test_add_paths(self, spec):
+        spec.options['basePath'] = '/v1'
+        spec.add_paths([
+            {'path': '/v1/pets', 'operations': {'get': {'responses': {}}}},
+            {'path': '/v1/pets', 'operations': {'post': {'responses': {}}}},
+            {'path': '/v1/stores'},
+        ])
+        assert set(spec._paths) == {'/pets', '/stores'}
+        assert 'get' in spec._paths['/pets']
+        assert 'post' in spec._paths['/pets']
+
+    def test_add_paths_uses_helpers(self, spec):
+        def path_helper(spec, view_func, **kwargs):
+            return Path(path=view_func['path'])
+        spec.register_path_helper(path_helper)
+        spec.add_paths({'view_func': {'path': '/pet/{0}'.format(i)}} for i in range(3))
+        assert len(spec._paths) == 3
+
     def test_add_parameters(self, spec):
         route_spec = self.paths['/pet/{petId}']['get']
 
@@ -200,6 +694,150 @@ class TestPath:
         assert route_spec['parameters'][0] == metadata['parameters']['test_parameter']
 
 
+class TestMerge:
+
+    @pytest.fixture()
+    def other(self):
+        return APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['tests.plugins.dummy_plugin'],
+            host='petstore.swagger.io',
+        )
+
+    def test_merge(self, spec, other):
+        spec.definition('Pet', properties={'name': {'type': 'string'}})
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        other.definition('Store', properties={'name': {'type': 'string'}})
+        other.add_parameter('limit', 'query', type='integer')
+        other.add_path('/pets', operations={'post': {'responses': {}}})
+        other.add_path('/stores', operations={'get': {'responses': {}}})
+        other.plugins['tests.plugins.dummy_plugin']['refs'] = {'Store': 'Store'}
+
+        assert spec.merge(other) is spec
+        assert set(spec._definitions) == {'Pet', 'Store'}
+        assert 'limit' in spec._parameters
+        assert set(spec._paths['/pets']) == {'get', 'post'}
+        assert spec._paths['/stores'].path == '/stores'
+        assert spec.options['host'] == 'petstore.swagger.io'
+        assert spec.plugins['tests.plugins.dummy_plugin'] == {'refs': {'Store': 'Store'}}
+        assert '/stores' in json.loads(spec.to_json())['paths']
+
+    def test_merge_identical_entries(self, spec, other):
+        for each in (spec, other):
+            each.definition('Pet', properties={'name': {'type': 'string'}})
+            each.add_path('/pets', operations={'get': {'responses': {}}})
+        spec.merge(other)
+        assert spec._paths['/pets'] == {'get': {'responses': {}}}
+
+    def test_merge_conflicts(self, spec, other):
+        spec.definition('Pet', properties={'name': {'type': 'string'}})
+        other.definition('Pet', properties={'name': {'type': 'integer'}})
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        other.add_path('/pets', operations={'get': {'responses': {'200': {}}}})
+        other.add_path('/stores', operations={'get': {'responses': {}}})
+        with pytest.raises(APISpecError) as excinfo:
+            spec.merge(other)
+        assert 'definitions "Pet"' in str(excinfo.value)
+        assert 'operation "GET /pets"' in str(excinfo.value)
+        assert '/stores' not in spec._paths
+
+    def test_merge_specs(self, spec, other):
+        third = APISpec(title='Swagger Petstore', version='1.0.0')
+        for index, each in enumerate((spec, other, third)):
+            each.add_path('/pets/{0}'.format(index))
+        assert merge_specs([spec, other, third]) is spec
+        assert len(spec._paths) == 3
+
+    def test_merge_specs_requires_a_spec(self):
+        with pytest.raises(APISpecError):
+            merge_specs([])
+
+    def test_merge_unpickled_spec(self, spec, other):
+        other.add_path('/pets', operations={'get': {'responses': {}}})
+        spec.merge(pickle.loads(pickle.dumps(other)))
+        assert spec._paths['/pets'].path == '/pets'
+
+
+class TestThreadSafe:
+
+    @pytest.fixture()
+    def spec(self):
+        return APISpec(title='Swagger Petstore', version='1.0.0', thread_safe=True)
+
+    def run_threads(self, func, count=8):
+        threads = [threading.Thread(target=func, args=(index,)) for index in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def test_concurrent_add_path(self, spec):
+        methods = ['get', 'put', 'post', 'delete', 'patch', 'head']
+
+        def register(index):
+            for number in range(50):
+                spec.add_path('/pets/{0}'.format(number), operations={
+                    methods[index % len(methods)]: {'responses': {}}
+                })
+                spec.add_path('/thread/{0}/{1}'.format(index, number))
+                spec.to_json()
+
+        self.run_threads(register, count=len(methods))
+        assert len(spec._paths) == 50 + 50 * len(methods)
+        for number in range(50):
+            assert set(spec._paths['/pets/{0}'.format(number)]) == set(methods)
+        assert len(json.loads(spec.to_json())['paths']) == len(spec._paths)
+
+    def test_add_path_copies_existing_path(self, spec):
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        before = spec._paths['/pets']
+        spec.add_path('/pets', operations={'post': {'responses': {}}})
+        assert set(before) == {'get'}
+        assert set(spec._paths['/pets']) == {'get', 'post'}
+
+    def test_concurrent_definitions_and_parameters(self, spec):
+        def register(index):
+            for number in range(50):
+                name = 'Pet{0}_{1}'.format(index, number)
+                spec.definition(name, properties={'id': {'type': 'integer'}})
+                spec.add_parameter(name, 'query', type='integer')
+                spec.fingerprint()
+
+        self.run_threads(register)
+        assert len(spec._definitions) == len(spec._parameters) == 8 * 50
+
+    def test_concurrent_merge(self, spec):
+        other = APISpec(title='Swagger Petstore', version='1.0.0', thread_safe=True)
+        for number in range(20):
+            spec.add_path('/pets/{0}'.format(number), operations={'get': {'responses': {}}})
+            other.add_path('/stores/{0}'.format(number), operations={'get': {'responses': {}}})
+
+        def merge(index):
+            for _ in range(20):
+                if index % 2:
+                    spec.merge(other)
+                else:
+                    other.merge(spec)
+        threads = [threading.Thread(target=merge, args=(index, )) for index in range(4)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+            assert not thread.is_alive(), 'merging specs into each other deadlocked'
+        assert spec.to_dict()['paths'] == other.to_dict()['paths']
+        assert len(spec.to_dict()['paths']) == 40
+
+    def test_pickle(self, spec):
+        spec.add_path('/pets', operations={'get': {'responses': {}}})
+        loaded = pickle.loads(pickle.dumps(spec))
+        assert loaded.thread_safe
+        loaded.add_path('/pets', operations={'post': {'responses': {}}})
+        assert set(loaded._paths['/pets']) == {'get', 'post'}
+        assert loaded.to_dict()['paths'] == loaded._paths
+
+
 class TestExtensions:
 
     DUMMY_PLUGIN = 'tests.plugins.dummy_plugin'
@@ -253,6 +891,36 @@ class TestExtensions:
 
         spec.definition('SpammitySpam', eggs=mock.MagicMock())
 
+    def test_helpers_are_dispatched_by_signature(self, spec):
+        calls = []
+
+        def helper1(spec, spam, **kwargs):
+            calls.append('helper1')
+
+        def helper2(spec, eggs, ham=None, **kwargs):
+            calls.append('helper2')
+
+        spec.register_path_helper(helper1)
+        spec.register_path_helper(helper2)
+        spec.add_path('/foo/bar', eggs=object())
+        assert calls == ['helper2']
+
+    def test_helper_without_kwargs_receives_accepted_arguments(self, spec):
+        def helper(spec, name, eggs):
+            return {'properties': {'eggs': eggs}}
+
+        spec.register_definition_helper(helper)
+        spec.definition('Pet', eggs='spam', ham='ham')
+        assert spec._definitions['Pet'] == {'properties': {'eggs': 'spam'}}
+
+    def test_type_error_in_helper_is_raised(self, spec):
+        def helper(spec, eggs, **kwargs):
+            raise TypeError('broken helper')
+
+        spec.register_path_helper(helper)
+        with pytest.raises(TypeError):
+            spec.add_path('/foo/bar', eggs=object())
+
 
 class TestDefinitionHelpers:
 
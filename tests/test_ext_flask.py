@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 import pytest
+import mock
 
 from flask import Flask
-from apispec import APISpec
+from apispec import APISpec, utils
 
 @pytest.fixture()
 def spec():
@@ -57,6 +58,45 @@ class TestPathHelpers:
         assert get_op['description'] == 'get a greeting'
         assert post_op['description'] == 'post a greeting'
 
+    def test_operations_skip_docstring_parsing(self, app, spec):
+
+        @app.route('/hello')
+        def hello():
+            """A greeting endpoint.
+
+            ---
+            get:
+                description: get a greeting
+            """
+            return 'hi'
+
+        operations = {'get': {'description': 'parsed ahead of time'}}
+        with mock.patch('apispec.utils.load_operations_from_docstring') as load:
+            spec.add_path(view=hello, operations=operations)
+        assert not load.called
+        assert spec._paths['/hello']['get']['description'] == 'parsed ahead of time'
+
+    def test_empty_operations_skip_docstring_parsing(self, app):
+        @app.route('/hello')
+        def hello():
+            """A greeting endpoint.
+
+            ---
+            get:
+                description: get a greeting
+            """
+            return 'hi'
+
+        spec = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['apispec.ext.flask', 'apispec.ext.marshmallow'],
+        )
+        with mock.patch('apispec.utils.load_operations_from_docstring') as load:
+            spec.add_path(view=hello, operations={})
+        assert not load.called
+        assert spec._paths['/hello'] == {}
+
     def test_integration_with_docstring_introspection(self, app, spec):
 
         @app.route('/hello')
@@ -102,3 +142,72 @@ class TestPathHelpers:
 
         spec.add_path(view=get_pet)
         assert '/pet/{pet_id}' in spec._paths
+
+    def test_docstring_is_parsed_once_for_all_helpers(self, app):
+        @app.route('/pets')
+        def pets():
+            """List pets.
+            ---
+            get:
+                responses:
+                    200:
+                        description: Pets
+            """
+            return 'pets'
+
+        spec = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['apispec.ext.flask', 'apispec.ext.marshmallow'],
+        )
+        utils.docstring_cache.clear()
+        spec.add_path(view=pets)
+        assert spec._paths['/pets']['get'] == {'responses': {200: {'description': 'Pets'}}}
+        assert (utils.docstring_cache.hits, utils.docstring_cache.misses) == (1, 1)
+
+    def test_docstring_parser(self, app):
+        @app.route('/pets')
+        def pets():
+            """List pets.
+            ---
+            get:
+                responses:
+                    200:
+                        description: Pets
+            """
+            return 'pets'
+
+        spec = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['apispec.ext.flask'],
+            docstring_parser=lambda text: {'get': {'description': text.strip()}},
+        )
+        spec.add_path(view=pets)
+        assert spec._paths['/pets']['get']['description'].startswith('get:')
+
+    def test_lazy_plugins_keep_declared_order(self, app):
+        @app.route('/pet')
+        def pet():
+            """A pet.
+            ---
+            get:
+                responses:
+                    200:
+                        schema: tests.schemas.PetSchema
+            """
+            return 'pet'
+
+        from tests.schemas import PetSchema
+        spec = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['apispec.ext.flask', 'apispec.ext.marshmallow'],
+            lazy_plugins=True,
+        )
+        spec.definition('Pet', schema=PetSchema)
+        assert 'apispec.ext.flask' in spec.plugins
+        spec.add_path(view=pet)
+        assert spec._paths['/pet']['get']['responses'][200]['schema'] == {
+            '$ref': '#/definitions/Pet'
+        }
@@ -1,5 +1,9 @@
 # -*- coding: utf-8 -*-
+import json
+
+import mock
 import pytest
+from marshmallow import Schema, fields
 
 from apispec import APISpec
 from apispec.ext.marshmallow import swagger
@@ -29,6 +33,39 @@ class TestDefinitionHelper:
         assert props['id']['type'] == 'integer'
         assert props['name']['type'] == 'string'
 
+    def test_lazy_definition(self):
+        spec = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['apispec.ext.marshmallow'],
+            lazy_definitions=True,
+        )
+        with mock.patch.object(swagger, 'schema2jsonschema',
+                               wraps=swagger.schema2jsonschema) as schema2jsonschema:
+            spec.definition('Pet', schema=PetSchema)
+            spec.add_path('/pet', view=lambda: None, operations={
+                'get': {'responses': {200: {'schema': PetSchema}}}
+            })
+            assert not schema2jsonschema.called
+            assert spec._paths['/pet']['get']['responses'][200]['schema'] == {
+                '$ref': '#/definitions/Pet'
+            }
+            assert spec.to_dict()['definitions']['Pet'] == swagger.schema2jsonschema(PetSchema)
+
+    def test_schema2jsonschema_before_plugin_setup(self):
+        spec = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['apispec.ext.marshmallow'],
+            lazy_plugins=True,
+        )
+        assert 'apispec.ext.marshmallow' not in spec.plugins
+        props = swagger.schema2jsonschema(PetWithCategorySchema, spec=spec)['properties']
+        assert props['category'] == swagger.schema2jsonschema(CategorySchema)
+        params = swagger.fields2parameters(PetWithCategorySchema._declared_fields,
+                                           schema_cls=PetWithCategorySchema, spec=spec)
+        assert params[0]['schema']['properties'] == props
+
 class TestOperationHelper:
 
     def test_schema(self, spec):
@@ -104,3 +141,81 @@ class TestOperationHelper:
         op = p['get']
         assert 'responses' in op
         assert op['responses'][200]['schema']['$ref'] == '#/definitions/Pet'
+
+
+class CategorySchema(Schema):
+    id = fields.Int()
+    name = fields.Str(required=True)
+
+    class Meta:
+        title = 'Category'
+
+class OwnerSchema(Schema):
+    name = fields.Str()
+
+class PetWithCategorySchema(Schema):
+    category = fields.Nested(CategorySchema)
+    owner = fields.Nested(OwnerSchema)
+
+class StoreSchema(Schema):
+    categories = fields.Nested(CategorySchema, many=True)
+    owner = fields.Nested(OwnerSchema)
+
+class TestHoistInlineSchemas:
+
+    def test_hoist_inline_schemas(self, spec):
+        spec.definition('Pet', schema=PetWithCategorySchema)
+        spec.definition('Store', schema=StoreSchema)
+        spec.add_path('/pet', operations={
+            'get': {'responses': {200: {'schema': swagger.schema2jsonschema(PetSchema)}}},
+            'post': {
+                'parameters': swagger.schema2parameters(PetWithCategorySchema),
+                'responses': {201: {'schema': swagger.schema2jsonschema(PetSchema)}},
+            },
+        })
+
+        hoisted = spec.hoist_inline_schemas()
+        assert sorted(hoisted) == ['Category', 'InlineSchema1', 'InlineSchema2']
+        assert hoisted['Category'] == swagger.schema2jsonschema(CategorySchema)
+
+        definitions = spec.to_dict()['definitions']
+        pet = definitions['Pet']['properties']
+        assert pet['category'] == {'$ref': '#/definitions/Category'}
+        store = definitions['Store']['properties']
+        assert store['categories']['items'] == {'$ref': '#/definitions/Category'}
+        assert store['owner'] == pet['owner']
+
+        operations = spec._paths['/pet']
+        get_schema = operations['get']['responses'][200]['schema']
+        assert get_schema == operations['post']['responses'][201]['schema']
+        assert definitions[get_schema['$ref'].split('/')[-1]] == swagger.schema2jsonschema(PetSchema)
+        # Identical to the Pet definition
+        body = operations['post']['parameters'][0]
+        assert body['schema'] == {'$ref': '#/definitions/Pet'}
+
+    def test_hoist_inline_schemas_min_count(self, spec):
+        spec.definition('Pet', schema=PetWithCategorySchema)
+        assert spec.hoist_inline_schemas(min_count=3) == {}
+        assert 'properties' in spec._definitions['Pet']['properties']['category']
+
+    def test_hoist_shared_schema_object(self, spec):
+        schema = {
+            'type': 'object',
+            'properties': {
+                'inner': {'type': 'object', 'properties': {'id': {'type': 'integer'}}},
+                'name': {'type': 'string'},
+            },
+        }
+        for path in ('/pets', '/stores'):
+            spec.add_path(path, operations={'get': {'responses': {200: {'schema': schema}}}})
+        spec.to_json()
+
+        hoisted = spec.hoist_inline_schemas()
+        assert sorted(hoisted) == ['InlineSchema1', 'InlineSchema2']
+        expected = {'$ref': '#/definitions/InlineSchema2'}
+        for path in ('/pets', '/stores'):
+            assert spec._paths[path]['get']['responses'][200]['schema'] == expected
+        assert hoisted['InlineSchema2']['properties']['inner'] == {
+            '$ref': '#/definitions/InlineSchema1'
+        }
+        assert 'InlineSchema2' in json.loads(spec.to_json())['definitions']
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Importing apispec must stay cheap for short-lived processes."""
+import os
+import sys
+import subprocess
+
+import pytest
+
+# Modules that are only imported when a feature needing them is used
+DEFERRED_MODULES = (
+    'yaml', 'inspect', 'hashlib', 'tempfile', 'subprocess', 'multiprocessing',
+    'marshmallow', 'flask',
+)
+# Cumulative import time of the apispec package, in microseconds, with
+# bytecode already compiled. Override with APISPEC_IMPORT_BUDGET_US on slow machines.
+IMPORT_TIME_BUDGET_US = int(os.environ.get('APISPEC_IMPORT_BUDGET_US', 40000))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code, *options):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env['PYTHONPATH'] = os.pathsep.join([ROOT, env.get('PYTHONPATH', '')])
+    return subprocess.check_output(
+        [sys.executable] + list(options) + ['-c', code],
+        stderr=subprocess.STDOUT, env=env,
+    ).decode('utf-8')
+
+
+@pytest.mark.parametrize('module', [
+    'apispec',
+    'apispec.utils',
+    'apispec.ext.marshmallow',
+    'apispec.ext.flask',
+])
+def test_heavy_modules_are_deferred(module):
+    output = run_python(
+        'import sys, {0}; print(" ".join(sorted(sys.modules)))'.format(module)
+    )
+    imported = set(output.split())
+    assert module in imported
+    assert imported.isdisjoint(DEFERRED_MODULES)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='-X importtime requires Python 3.7+')
+def test_import_time_budget():
+    # The first run compiles the bytecode
+    run_python('import apispec')
+    timings = []
+    for _ in range(3):
+        output = run_python('import apispec', '-X', 'importtime')
+        for line in output.splitlines():
+            # import time: self [us] | cumulative | imported package
+            fields = [field.strip() for field in line.split('|')]
+            if fields[-1] == 'apispec':
+                timings.append(int(fields[1]))
+    assert len(timings) == 3
+    assert min(timings) <= IMPORT_TIME_BUDGET_US
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+import mock
+
+from apispec import APISpec, plugins
+from apispec.exceptions import PluginError
+from tests.plugins import lazy_plugin
+
+PLUGIN = 'tests.plugins.lazy_plugin'
+
+
+@pytest.fixture(autouse=True)
+def reset_setup_calls():
+    del lazy_plugin.setup_calls[:]
+
+
+@pytest.fixture()
+def index(tmpdir):
+    return str(tmpdir.join('cache', 'plugins.json'))
+
+
+@pytest.fixture()
+def entry_points():
+    points = [(PLUGIN, 'lazy-dist', '1.0'), ('tests.plugins.dummy_plugin', 'dummy-dist', '2.0')]
+    with mock.patch('apispec.plugins._entry_points', return_value=points) as patched:
+        yield patched
+
+
+class TestLazyPlugins:
+
+    def test_setup_is_deferred_until_triggered(self):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0',
+                       plugins=[PLUGIN], lazy_plugins=True)
+        assert lazy_plugin.setup_calls == []
+        assert PLUGIN not in spec.plugins
+        spec.add_path('/pets')
+        spec.definition('Pet', properties={})
+        assert lazy_plugin.setup_calls == []
+        spec.add_path(resource='stores')
+        assert lazy_plugin.setup_calls == [spec]
+        assert PLUGIN in spec.plugins
+        assert '/stores' in spec._paths
+        spec.add_path(resource='users')
+        assert len(lazy_plugin.setup_calls) == 1
+
+    def test_definition_trigger(self):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0')
+        spec.setup_plugin(PLUGIN, triggers={'definition': ['model']})
+        spec.definitions([{'name': 'Pet', 'properties': {}}, {'name': 'Store', 'model': ['name']}])
+        assert spec._definitions['Store']['properties'] == {'name': {'type': 'string'}}
+
+    def test_add_paths_trigger(self):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0')
+        spec.setup_plugin(PLUGIN, triggers={'path': ['resource']})
+        spec.add_paths([{'path': '/pets'}, {'resource': 'stores'}])
+        assert set(spec._paths) == {'/pets', '/stores'}
+
+    def test_plugins_without_triggers_are_set_up_eagerly(self):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0',
+                       plugins=['tests.plugins.dummy_plugin'], lazy_plugins=True)
+        assert 'tests.plugins.dummy_plugin' in spec.plugins
+
+    def test_builtin_plugins_declare_triggers(self):
+        assert plugins.plugin_triggers('apispec.ext.flask') == {'path': ['view']}
+        assert plugins.plugin_triggers('apispec.ext.marshmallow') == {
+            'path': ['view'], 'definition': ['schema']
+        }
+
+    def test_invalid_plugin(self):
+        with pytest.raises(PluginError):
+            APISpec(title='Swagger Petstore', version='1.0.0',
+                    plugins=['plugin_does_not_exist'], lazy_plugins=True)
+
+
+class TestDiscover:
+
+    def test_discover(self, entry_points, index):
+        assert plugins.discover(index) == {
+            PLUGIN: {'definition': ['model'], 'path': ['resource']},
+            'tests.plugins.dummy_plugin': None,
+        }
+        with open(index) as fp:
+            stored = json.load(fp)
+        assert stored['plugins'][PLUGIN]['version'] == '1.0'
+
+    def test_index_avoids_imports(self, entry_points, index):
+        expected = plugins.discover(index)
+        with mock.patch('apispec.plugins.plugin_triggers') as plugin_triggers:
+            assert plugins.discover(index) == expected
+        assert not plugin_triggers.called
+
+    def test_index_is_refreshed_on_new_version(self, entry_points, index):
+        plugins.discover(index)
+        entry_points.return_value = [(PLUGIN, 'lazy-dist', '1.1')]
+        with mock.patch('apispec.plugins.plugin_triggers', return_value=None) as plugin_triggers:
+            assert plugins.discover(index) == {PLUGIN: None}
+        plugin_triggers.assert_called_once_with(PLUGIN)
+
+    def test_index_location(self, entry_points, index, monkeypatch):
+        monkeypatch.setenv('APISPEC_PLUGIN_INDEX', index)
+        plugins.discover()
+        with open(index) as fp:
+            assert PLUGIN in json.load(fp)['plugins']
+
+    def test_discover_plugins(self, entry_points, index, monkeypatch):
+        monkeypatch.setenv('APISPEC_PLUGIN_INDEX', index)
+        spec = APISpec(title='Swagger Petstore', version='1.0.0', discover_plugins=True)
+        assert 'tests.plugins.dummy_plugin' in spec.plugins
+        assert PLUGIN not in spec.plugins
+        spec.add_path(resource='pets')
+        assert PLUGIN in spec.plugins
+        assert '/pets' in spec._paths
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import sys
+import marshal
+
+import pytest
+import mock
+from flask import Flask
+
+from apispec import APISpec, utils
+from apispec.exceptions import APISpecError
+from apispec.precompile import (
+    PrecompiledOperations, compile_packages, write_artifact, qualified_name, main,
+)
+
+from .precompiled_views import pets, index
+
+
+@pytest.fixture()
+def artifact(tmpdir):
+    path = str(tmpdir.join('operations.bin'))
+    assert main(['tests.precompiled_views', '-o', path]) == 0
+    return path
+
+
+class TestCompile:
+
+    def test_compile_packages(self):
+        entries = compile_packages(['tests.precompiled_views'])
+        assert sorted(entries) == sorted([
+            'tests.precompiled_views.pets:PetView',
+            'tests.precompiled_views.pets:PetView.put' if sys.version_info >= (3, 3)
+            else 'tests.precompiled_views.pets:put',
+            'tests.precompiled_views.pets:list_pets',
+            'tests.precompiled_views:index',
+        ])
+        digest, data = entries['tests.precompiled_views.pets:list_pets']
+        assert marshal.loads(data) == utils.load_operations_from_docstring(pets.list_pets.__doc__)
+
+    def test_main(self, capsys, artifact):
+        assert 'Wrote 4 docstrings' in capsys.readouterr()[0]
+        precompiled = PrecompiledOperations(artifact)
+        assert len(precompiled) == 4
+        assert precompiled.parser == 'auto'
+
+
+class TestPrecompiledOperations:
+
+    def test_get(self, artifact):
+        precompiled = PrecompiledOperations(artifact)
+        operations = precompiled.get(pets.list_pets)
+        assert operations == {'get': {'responses': {200: {'description': 'Pets'}}}}
+        operations['get']['responses'][200]['description'] = 'changed'
+        assert precompiled.get(pets.list_pets)['get']['responses'][200]['description'] == 'Pets'
+        assert precompiled.get(pets.PetView)['get']['responses'][200]['description'] == 'A pet'
+
+    def test_missing_views(self, artifact):
+        precompiled = PrecompiledOperations(artifact)
+        for view in (pets.undocumented, pets.dated, lambda: None):
+            with pytest.raises(KeyError):
+                precompiled.get(view)
+
+    def test_changed_docstring(self, artifact):
+        def list_pets():
+            """List pets, changed.
+            ---
+            get: {}
+            """
+        list_pets.__module__ = pets.__name__
+        list_pets.__qualname__ = 'list_pets'
+        precompiled = PrecompiledOperations(artifact)
+        assert qualified_name(list_pets) == qualified_name(pets.list_pets)
+        with pytest.raises(KeyError):
+            precompiled.get(list_pets)
+
+    def test_wrapper_found_by_docstring(self, artifact):
+        def wrapper():
+            pass
+        wrapper.__doc__ = index.__doc__
+        precompiled = PrecompiledOperations(artifact)
+        assert precompiled.get(wrapper) == {'get': {'responses': {200: {'description': 'Index'}}}}
+
+    def test_other_python_version(self, tmpdir):
+        path = str(tmpdir.join('operations.bin'))
+        with open(path, 'wb') as fp:
+            marshal.dump(({'format': 1, 'python': (2, 6), 'parser': 'auto'}, {}), fp)
+        with pytest.raises(APISpecError):
+            PrecompiledOperations(path)
+
+    def test_invalid_artifact(self, tmpdir):
+        with pytest.raises(APISpecError):
+            PrecompiledOperations(str(tmpdir.join('missing.bin')))
+        path = tmpdir.join('invalid.bin')
+        path.write('not marshal')
+        with pytest.raises(APISpecError):
+            PrecompiledOperations(str(path))
+
+
+class TestSpec:
+
+    @pytest.mark.parametrize('plugin', ['apispec.ext.flask', 'apispec.ext.marshmallow'])
+    def test_docstrings_are_not_parsed(self, artifact, plugin):
+        app = Flask(__name__)
+        app.add_url_rule('/pets', view_func=pets.list_pets)
+        spec = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['apispec.ext.flask', plugin],
+            precompiled=artifact,
+        )
+        assert isinstance(spec.precompiled, PrecompiledOperations)
+        with app.test_request_context():
+            with mock.patch('apispec.utils.load_yaml_from_docstring') as load:
+                spec.add_path(view=pets.list_pets)
+        assert not load.called
+        assert spec._paths['/pets'] == {'get': {'responses': {200: {'description': 'Pets'}}}}
+
+    @pytest.mark.parametrize('parser', ['yaml', utils.parse_json, lambda text: {}])
+    def test_parser_mismatch(self, artifact, parser):
+        with pytest.raises(APISpecError):
+            APISpec(title='Swagger Petstore', version='1.0.0',
+                    docstring_parser=parser, precompiled=artifact)
+
+    @pytest.mark.parametrize('parser', [None, 'auto', utils.parse_auto])
+    def test_parser_match(self, artifact, parser):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0',
+                       docstring_parser=parser, precompiled=artifact)
+        assert spec.precompiled.parser == 'auto'
+
+    def test_unknown_views_are_parsed(self, tmpdir):
+        path = str(tmpdir.join('operations.bin'))
+        write_artifact(path, {})
+        app = Flask(__name__)
+        app.add_url_rule('/pets', view_func=pets.list_pets)
+        spec = APISpec(
+            title='Swagger Petstore',
+            version='1.0.0',
+            plugins=['apispec.ext.flask'],
+            precompiled=PrecompiledOperations(path),
+        )
+        with app.test_request_context():
+            spec.add_path(view=pets.list_pets)
+        assert spec._paths['/pets'] == {'get': {'responses': {200: {'description': 'Pets'}}}}
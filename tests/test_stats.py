@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import sys
+import time
+import pickle
+import functools
+
+import pytest
+import mock
+
+from apispec import APISpec, Path
+from apispec.stats import HelperStats, target_name, deep_sizeof
+
+
+def path_helper(spec, resource, **kwargs):
+    return Path(path='/' + resource, operations={'get': {'responses': {200: {}}}})
+
+
+def response_helper(spec, **kwargs):
+    return {'description': 'ok'}
+
+
+def definition_helper(spec, name, fmt, **kwargs):
+    return lambda: {'properties': {'age': {'type': 'number', 'format': fmt}}}
+
+
+def failing_helper(spec, fail, **kwargs):
+    raise ValueError(fail)
+
+
+def slow_definition_helper(spec, name, delay, fail=False, **kwargs):
+    def build():
+        time.sleep(delay)
+        if fail:
+            raise ValueError('deferred failure')
+        return {'type': 'object'}
+    return build
+
+
+@pytest.fixture()
+def stats():
+    return HelperStats()
+
+
+@pytest.fixture()
+def spec(stats):
+    spec = APISpec(
+        title='Swagger Petstore',
+        version='1.0.0',
+        plugins=['tests.plugins.dummy_plugin'],
+        stats=stats,
+    )
+    spec.register_path_helper(path_helper)
+    spec.register_path_helper(failing_helper)
+    spec.register_response_helper(response_helper, 'get', 200)
+    spec.register_definition_helper(definition_helper)
+    return spec
+
+
+class TestHelperStats:
+
+    def test_helpers_are_timed(self, spec, stats):
+        spec.add_path(resource='pets')
+        spec.add_path(resource='stores')
+        spec.definition('Age', fmt='int32')
+        timings = stats.timings
+        assert timings[('path_helper', target_name(path_helper))].calls == 2
+        assert timings[('response_helper', target_name(response_helper))].calls == 2
+        assert timings[('definition_helper', target_name(definition_helper))].calls == 1
+        assert timings[('plugin', 'tests.plugins.dummy_plugin')].calls == 1
+        assert ('path_helper', target_name(failing_helper)) not in timings
+        assert all(timing.time >= 0 for timing in timings.values())
+        assert stats.total_time() >= stats.total_time('path_helper')
+
+    def test_errors_are_recorded(self, spec, stats):
+        with pytest.raises(ValueError):
+            spec.add_path(resource='pets', fail='boom')
+        timing = stats.timings[('path_helper', target_name(failing_helper))]
+        assert timing.calls == 1
+        assert timing.errors == 1
+        assert timing.last_error == repr(ValueError('boom'))
+
+    @pytest.mark.parametrize('lazy_definitions', [False, True])
+    def test_deferred_work_is_charged_to_helper(self, stats, lazy_definitions):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0',
+                       lazy_definitions=lazy_definitions, stats=stats)
+        spec.register_definition_helper(slow_definition_helper)
+        spec.definition('Pet', delay=0.05)
+        spec.to_dict()
+        timing = stats.timings[('definition_helper', target_name(slow_definition_helper))]
+        assert timing.calls == 1
+        assert timing.time >= 0.05
+        assert len(stats.timings) == 1
+
+    def test_deferred_errors_are_recorded(self, stats):
+        spec = APISpec(title='Swagger Petstore', version='1.0.0', stats=stats)
+        spec.register_definition_helper(slow_definition_helper)
+        with pytest.raises(ValueError):
+            spec.definition('Pet', delay=0, fail=True)
+        timing = stats.timings[('definition_helper', target_name(slow_definition_helper))]
+        assert (timing.calls, timing.errors) == (1, 1)
+        assert 'deferred failure' in timing.last_error
+
+    def test_marshmallow_conversion_is_timed(self, stats):
+        from apispec.ext.marshmallow import schema_definition_helper
+        from .schemas import PetSchema
+        spec = APISpec(title='Swagger Petstore', version='1.0.0',
+                       plugins=['apispec.ext.marshmallow'], stats=stats)
+        with mock.patch('apispec.ext.marshmallow.swagger.schema2jsonschema',
+                        side_effect=lambda *args, **kwargs: time.sleep(0.05) or {}):
+            spec.definition('Pet', schema=PetSchema)
+        timing = stats.timings[('definition_helper', target_name(schema_definition_helper))]
+        assert timing.time >= 0.05
+
+    def test_callback(self):
+        callback = mock.Mock()
+        spec = APISpec(title='Swagger Petstore', version='1.0.0', stats=callback)
+        spec.register_path_helper(path_helper)
+        spec.add_path(resource='pets')
+        kind, target, elapsed = callback.call_args[0]
+        assert (kind, target) == ('path_helper', path_helper)
+        assert elapsed >= 0
+
+    def test_report(self, spec, stats):
+        spec.add_path(resource='pets')
+        report = stats.report()
+        assert target_name(path_helper) in report
+        assert 'tests.plugins.dummy_plugin' in report
+        stats.clear()
+        assert stats.timings == {}
+
+    def test_pickle(self, spec, stats):
+        spec.add_path(resource='pets')
+        loaded = pickle.loads(pickle.dumps(stats))
+        loaded('path_helper', path_helper, 1.0)
+        assert loaded.timings[('path_helper', target_name(path_helper))].calls == 2
+
+
+class TestDeepSizeof:
+
+    def test_containers_are_walked(self):
+        value = 'x' * 1000
+        assert deep_sizeof({'a': [value]}) > sys.getsizeof(value) + sys.getsizeof([value])
+        assert deep_sizeof(Path(path='/pets', operations={'get': {'a': value}})) > 1000
+
+    def test_shared_objects_are_counted_once(self):
+        value = 'x' * 1000
+        seen = set()
+        assert deep_sizeof([value], seen) > 1000
+        assert deep_sizeof([value], seen) < 1000
+        assert deep_sizeof([value, value]) < 2000
+
+    def test_code_is_not_counted(self):
+        assert deep_sizeof([path_helper]) == sys.getsizeof([path_helper])
+        partial = functools.partial(path_helper, 'x' * 1000)
+        assert deep_sizeof(partial) > 1000
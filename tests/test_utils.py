@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
-from apispec import utils
+import pytest
+
+from apispec import utils, exceptions
 
 def test_load_yaml_from_docstring():
     def f():
@@ -14,3 +16,200 @@ def test_load_yaml_from_docstring():
         """
     result = utils.load_yaml_from_docstring(f.__doc__)
     assert result == {'herp': 1, 'derp': 2}
+
+def view_with_operations():
+    """A view.
+
+    ---
+    get:
+        responses:
+            200:
+                description: ok
+    """
+
+def view_without_operations():
+    """A view without operations."""
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_load_operations_from_views(processes):
+    views = [view_with_operations, view_without_operations, view_with_operations]
+    result = utils.load_operations_from_views(views, processes=processes)
+    expected_ops = {'get': {'responses': {200: {'description': 'ok'}}}}
+    assert result == [expected_ops, None, expected_ops]
+
+@pytest.mark.parametrize('processes', [1, 2])
+def test_load_operations_from_views_without_docstrings(processes):
+    result = utils.load_operations_from_views([view_without_operations] * 3, processes=processes)
+    assert result == [None, None, None]
+
+def test_load_yaml_from_docstring_is_cached():
+    utils.docstring_cache.clear()
+    first = utils.load_yaml_from_docstring(view_with_operations.__doc__)
+    first['get']['responses'][200]['description'] = 'changed'
+    second = utils.load_yaml_from_docstring(view_with_operations.__doc__)
+    assert second == {'get': {'responses': {200: {'description': 'ok'}}}}
+    assert (utils.docstring_cache.hits, utils.docstring_cache.misses) == (1, 1)
+
+def test_docstring_cache_holds_a_large_api():
+    docstrings = ['View {0}.\n---\nget: {{}}\n'.format(index) for index in range(4000)]
+    utils.docstring_cache.clear()
+    for _ in range(2):
+        for docstring in docstrings:
+            utils.load_yaml_from_docstring(docstring)
+    assert (utils.docstring_cache.hits, utils.docstring_cache.misses) == (4000, 4000)
+
+def test_docstring_cache_evicts_least_recently_used():
+    cache = utils.DocstringCache(maxsize=2)
+    parse = lambda key: {'key': key}
+    for key in ('a', 'b', 'a', 'c'):
+        cache.get(key, parse)
+    assert list(cache._entries) == ['a', 'c']
+    assert (cache.hits, cache.misses) == (1, 3)
+    cache.maxsize = 1
+    assert list(cache._entries) == ['c']
+    cache.maxsize = 0
+    assert cache.get('d', parse) == {'key': 'd'}
+    assert len(cache) == 0
+    cache.clear()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+class TestFrontMatterScanner:
+
+    def test_docstring_without_marker_is_not_cached(self):
+        utils.docstring_cache.clear()
+        assert utils.load_yaml_from_docstring(view_without_operations.__doc__) is None
+        assert utils.load_yaml_from_docstring('Foo --- bar') is None
+        assert (utils.docstring_cache.hits, utils.docstring_cache.misses) == (0, 1)
+        assert utils.load_yaml_from_docstring('') is None
+
+    def test_marker_must_start_a_line(self):
+        docstring = "Foo --- bar\n\n    ---\n    herp: 1\n"
+        assert utils.load_yaml_from_docstring(docstring) == {'herp': 1}
+
+    def test_same_result_as_trim_and_dedent(self):
+        def f():
+            """Summary with --- inside.
+
+                Indented text.
+            ---
+            get:
+            \tdescription: |
+                    Keeps
+                      relative indent
+                responses:
+
+                    200:
+                        description: ok
+            """
+        lines = utils.trim_docstring(f.__doc__).split('\n')
+        start = [index for index, line in enumerate(lines) if line.strip().startswith('---')][0]
+        import yaml
+        expected = yaml.safe_load(utils.dedent('\n'.join(lines[start:])))
+        assert utils.load_yaml_from_docstring(f.__doc__, parser='yaml') == expected
+
+    def test_invalid_yaml_warns_with_docstring_line(self):
+        def f():
+            """Summary.
+
+            ---
+            get:
+                responses: [
+            """
+        with pytest.warns(exceptions.DocstringWarning) as record:
+            assert utils.load_yaml_from_docstring(f.__doc__, parser='yaml') is None
+        message = str(record[0].message)
+        assert "'Summary.'" in message
+        assert 'at line 6:' in message
+
+    def test_invalid_json_warns_with_docstring_line(self):
+        docstring = 'Summary.\n---\n{"get":\n  {"responses" 1}}'
+        with pytest.warns(exceptions.DocstringWarning) as record:
+            assert utils.load_yaml_from_docstring(docstring, parser='json') is None
+        assert 'at line 4:' in str(record[0].message)
+
+    def test_parser_error_without_line(self):
+        def parser(text):
+            raise ValueError('invalid')
+        with pytest.warns(exceptions.DocstringWarning) as record:
+            assert utils.load_yaml_from_docstring('Foo\n\n---\nbar', parser=parser) is None
+        assert 'at line 3: invalid' in str(record[0].message)
+
+    def test_several_markers_are_invalid(self):
+        docstring = 'Summary.\n\n---\n---\nget:\n    description: first\n'
+        with pytest.warns(exceptions.DocstringWarning) as record:
+            assert utils.load_yaml_from_docstring(docstring, parser='yaml') is None
+        assert 'at line 4:' in str(record[0].message)
+
+    def test_warning_is_repeated_on_cache_hits(self):
+        docstring = 'Summary.\n---\nget: [\n'
+        utils.docstring_cache.clear()
+        for _ in range(2):
+            with pytest.warns(exceptions.DocstringWarning) as record:
+                assert utils.load_yaml_from_docstring(docstring, parser='yaml') is None
+            assert 'at line 4:' in str(record[0].message)
+        assert (utils.docstring_cache.hits, utils.docstring_cache.misses) == (1, 1)
+
+def view_with_json():
+    """A view documented with JSON.
+
+    ---
+    {"get": {"responses": {"200": {"description": "ok"}}}}
+    """
+
+class TestDocstringParsers:
+
+    @pytest.mark.parametrize('parser', [None, 'auto', 'json', 'yaml', utils.parse_auto])
+    def test_json_docstring(self, parser):
+        result = utils.load_yaml_from_docstring(view_with_json.__doc__, parser=parser)
+        assert result == {'get': {'responses': {'200': {'description': 'ok'}}}}
+
+    def test_auto_falls_back_to_yaml(self):
+        assert utils.parse_auto('{a: 1}') == {'a': 1}
+        assert utils.parse_auto('a: [1, 2]') == {'a': [1, 2]}
+
+    def test_json_parser_rejects_yaml(self):
+        with pytest.warns(exceptions.DocstringWarning):
+            assert utils.load_yaml_from_docstring(
+                view_with_operations.__doc__, parser='json') is None
+
+    def test_yaml_parser_is_safe(self):
+        with pytest.raises(ValueError):
+            utils.parse_yaml('!!python/object/apply:os.getcwd []')
+
+    def test_invalid_yaml_returns_none(self):
+        def f():
+            """
+            ---
+            get: [
+            """
+        with pytest.warns(exceptions.DocstringWarning):
+            assert utils.load_yaml_from_docstring(f.__doc__) is None
+
+    def test_register_docstring_parser(self, monkeypatch):
+        monkeypatch.setitem(utils.DOCSTRING_PARSERS, 'upper', lambda text: text.strip().upper())
+        assert utils.get_docstring_parser('upper')('a') == 'A'
+        assert utils.load_yaml_from_docstring(view_with_json.__doc__, parser='upper') == \
+            '{"GET": {"RESPONSES": {"200": {"DESCRIPTION": "OK"}}}}'
+        utils.register_docstring_parser('lower', str.lower)
+        try:
+            assert utils.get_docstring_parser('lower') is str.lower
+        finally:
+            del utils.DOCSTRING_PARSERS['lower']
+
+    def test_unknown_parser(self):
+        with pytest.raises(utils.exceptions.APISpecError):
+            utils.get_docstring_parser('toml')
+
+    def test_cache_is_keyed_by_parser(self):
+        utils.docstring_cache.clear()
+        assert utils.load_yaml_from_docstring(view_with_operations.__doc__, parser='yaml')
+        with pytest.warns(exceptions.DocstringWarning):
+            assert utils.load_yaml_from_docstring(
+                view_with_operations.__doc__, parser='json') is None
+        assert (utils.docstring_cache.hits, utils.docstring_cache.misses) == (0, 2)
+
+    @pytest.mark.parametrize('processes', [1, 2])
+    def test_load_operations_from_views(self, processes):
+        result = utils.load_operations_from_views(
+            [view_with_json, view_with_operations], processes=processes, parser='json')
+        assert result == [{'get': {'responses': {'200': {'description': 'ok'}}}}, None]